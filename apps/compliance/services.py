@@ -7,6 +7,7 @@ import logging
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 from django.db import transaction
+from django.db.models import OuterRef, Subquery
 from django.utils import timezone
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
@@ -101,9 +102,14 @@ class ComplianceWorkflowService:
             'max_score': 0
         }
         
+        # Check records are written together once every rule has run
+        compliance_checks = []
+        
         for rule in applicable_rules:
             try:
-                check_result = self._execute_compliance_check(customer, rule, initiated_by)
+                check_result = self._execute_compliance_check(
+                    customer, rule, initiated_by, compliance_checks
+                )
                 
                 if check_result['status'] == 'PASSED':
                     results['passed'].append(check_result)
@@ -124,15 +130,24 @@ class ComplianceWorkflowService:
                     'error': str(e)
                 })
         
+        ComplianceCheck.objects.bulk_create(compliance_checks)
+        
         return results
     
-    def _execute_compliance_check(self, customer: Customer, rule: ComplianceRule, initiated_by: User = None) -> Dict:
-        """Execute individual compliance check"""
+    def _execute_compliance_check(self, customer: Customer, rule: ComplianceRule,
+                                  initiated_by: User = None,
+                                  compliance_checks: Optional[List[ComplianceCheck]] = None) -> Dict:
+        """
+        Execute individual compliance check
+        
+        The check record is appended unsaved to ``compliance_checks`` for
+        the caller to insert in batch, or saved right away when no list is given.
+        """
         
         logger.debug(f"Executing compliance check {rule.name} for customer {customer.id}")
         
-        # Create compliance check record
-        compliance_check = ComplianceCheck.objects.create(
+        # Compliance check record, written once with its results
+        compliance_check = ComplianceCheck(
             customer=customer,
             rule=rule,
             check_status='IN_PROGRESS',
@@ -162,7 +177,6 @@ class ComplianceWorkflowService:
             compliance_check.result_details = result.get('details', '')
             compliance_check.risk_score = result.get('score', 0)
             compliance_check.completed_date = timezone.now()
-            compliance_check.save()
             
             result['check_id'] = compliance_check.id
             result['rule_id'] = rule.id
@@ -173,8 +187,14 @@ class ComplianceWorkflowService:
         except Exception as e:
             compliance_check.check_status = 'FAILED'
             compliance_check.result_details = f"Error: {str(e)}"
-            compliance_check.save()
+            compliance_check.completed_date = timezone.now()
             raise
+            
+        finally:
+            if compliance_checks is None:
+                compliance_check.save()
+            else:
+                compliance_checks.append(compliance_check)
     
     def _check_kyc_compliance(self, customer: Customer, rule: ComplianceRule) -> Dict:
         """Check KYC (Know Your Customer) compliance"""
@@ -216,8 +236,8 @@ class ComplianceWorkflowService:
         
         # Check beneficial ownership (for legal entities)
         if customer.customer_type == 'LEGAL_ENTITY':
-            beneficial_owners = customer.beneficial_owners.all()
-            if not beneficial_owners.exists():
+            beneficial_owners = list(customer.beneficial_owners.all())
+            if not beneficial_owners:
                 issues.append("No beneficial owners declared")
                 score += 25
             else:
@@ -314,19 +334,23 @@ class ComplianceWorkflowService:
             issues.append("Sanctions screening outdated")
             score += 10
         
-        # Check beneficial owners sanctions screening
-        for bo in customer.beneficial_owners.all():
-            bo_sanctions = SanctionsCheck.objects.filter(
-                beneficial_owner=bo
-            ).order_by('-check_date').first()
-            
-            if not bo_sanctions:
+        # Check beneficial owners sanctions screening, with each owner's latest
+        # match status annotated in the same query (None when never screened)
+        latest_bo_sanctions = SanctionsCheck.objects.filter(
+            beneficial_owner=OuterRef('pk')
+        ).order_by('-check_date').values('match_status')[:1]
+        beneficial_owners = customer.beneficial_owners.annotate(
+            latest_match_status=Subquery(latest_bo_sanctions)
+        )
+        
+        for bo in beneficial_owners:
+            if bo.latest_match_status is None:
                 issues.append(f"No sanctions screening for beneficial owner: {bo.full_name}")
                 score += 15
-            elif bo_sanctions.match_status == 'MATCH':
+            elif bo.latest_match_status == 'MATCH':
                 issues.append(f"Beneficial owner matches sanctions list: {bo.full_name}")
                 score += 50
-            elif bo_sanctions.match_status == 'POTENTIAL_MATCH':
+            elif bo.latest_match_status == 'POTENTIAL_MATCH':
                 issues.append(f"Potential sanctions match for beneficial owner: {bo.full_name}")
                 score += 20
         
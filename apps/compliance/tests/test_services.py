@@ -0,0 +1,102 @@
+"""
+CERES Simplified - Testes Unitários para Serviços de Compliance
+Testes do número de consultas das verificações de compliance
+"""
+
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from apps.customers.models import Customer, BeneficialOwner
+from apps.compliance.models import ComplianceRule, ComplianceCheck
+from apps.compliance.services import ComplianceWorkflowService
+from apps.sanctions.models import SanctionsCheck
+
+
+class ComplianceWorkflowServiceTest(TestCase):
+    """Testes unitários para ComplianceWorkflowService"""
+    
+    # Verificação do cliente e beneficiários com o último status anotado
+    SANCTIONS_CHECK_QUERY_BUDGET = 2
+    
+    @classmethod
+    def setUpTestData(cls):
+        """Configuração inicial para os testes"""
+        cls.customer = Customer.objects.create(
+            customer_type=Customer.CustomerType.CORPORATE,
+            full_name='Empresa Teste LTDA',
+            document_number='12345678000195',
+            email='contato@empresa.com',
+            phone='+5511999999999',
+            address='Rua Teste, 123',
+            city='São Paulo',
+            state='SP',
+            postal_code='01234-567'
+        )
+        
+        cls.sanctions_rule = ComplianceRule.objects.create(
+            name='Sanctions Screening',
+            description='Screen customer against sanctions lists',
+            rule_type='SANCTIONS',
+            severity='CRITICAL',
+            auto_check=True
+        )
+    
+    def setUp(self):
+        """Configuração inicial"""
+        self.service = ComplianceWorkflowService()
+    
+    def create_beneficial_owners(self, count):
+        """Criar beneficiários finais, todos já verificados em sanções"""
+        start = self.customer.beneficial_owners.count()
+        owners = BeneficialOwner.objects.bulk_create([
+            BeneficialOwner(
+                customer=self.customer,
+                full_name=f'Sócio {index}',
+                document_number=f'{index:011d}',
+                ownership_percentage=Decimal('10.00')
+            )
+            for index in range(start, start + count)
+        ])
+        SanctionsCheck.objects.bulk_create([
+            SanctionsCheck(beneficial_owner=owner, search_name=owner.full_name)
+            for owner in owners
+        ])
+    
+    def test_sanctions_compliance_query_budget(self):
+        """Teste de consultas constantes na verificação de sanções dos beneficiários"""
+        self.create_beneficial_owners(1)
+        with self.assertNumQueries(self.SANCTIONS_CHECK_QUERY_BUDGET):
+            self.service._check_sanctions_compliance(self.customer, self.sanctions_rule)
+        
+        self.create_beneficial_owners(3)
+        with self.assertNumQueries(self.SANCTIONS_CHECK_QUERY_BUDGET):
+            result = self.service._check_sanctions_compliance(self.customer, self.sanctions_rule)
+        
+        # Beneficiários verificados não geram pendências
+        self.assertEqual(result['issues'], ['No sanctions screening performed'])
+    
+    def test_compliance_checks_written_in_one_insert(self):
+        """Teste de gravação das verificações de todas as regras em um único INSERT"""
+        ComplianceRule.objects.create(
+            name='PEP Screening',
+            description='Check politically exposed persons',
+            rule_type='PEP',
+            severity='HIGH',
+            auto_check=True
+        )
+        
+        with CaptureQueriesContext(connection) as queries:
+            self.service._run_compliance_checks(self.customer)
+        
+        check_writes = [
+            query['sql'].split()[0] for query in queries.captured_queries
+            if 'compliance_compliancecheck' in query['sql'].split('(')[0]
+        ]
+        self.assertEqual(check_writes, ['INSERT'])
+        self.assertEqual(
+            set(ComplianceCheck.objects.filter(customer=self.customer).values_list('rule__name', flat=True)),
+            {'Sanctions Screening', 'PEP Screening'}
+        )
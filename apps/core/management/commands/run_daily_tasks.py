@@ -6,10 +6,11 @@ Management command for running daily business logic automation
 import logging
 from django.core.management.base import BaseCommand
 from django.utils import timezone
-from django.db.models import Q
+from django.db.models import Prefetch, Q
 from datetime import timedelta
 
 from apps.customers.models import Customer
+from apps.risk.models import RiskAssessment
 from apps.risk.services import RiskCalculationService, RiskMonitoringService
 from apps.sanctions.services import SanctionsScreeningService
 from apps.compliance.services import ComplianceWorkflowService
@@ -79,6 +80,13 @@ class Command(BaseCommand):
             Q(last_risk_assessment__isnull=True)
         ).filter(
             onboarding_status__in=['APPROVED', 'ACTIVE']
+        ).prefetch_related(
+            # Monitoring compares each customer with its current assessment
+            Prefetch(
+                'risk_assessments',
+                queryset=RiskAssessment.objects.filter(is_current=True),
+                to_attr='current_risk_assessments'
+            )
         )
         
         if self.verbose:
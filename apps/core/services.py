@@ -46,6 +46,8 @@ class CustomerOnboardingOrchestrator:
             with transaction.atomic():
                 onboarding_results = {
                     'customer_id': customer.id,
+                    # Same instance the workflow steps updated, so callers need not reload it
+                    'customer': customer,
                     'status': 'IN_PROGRESS',
                     'steps_completed': [],
                     'steps_failed': [],
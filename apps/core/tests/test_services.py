@@ -0,0 +1,95 @@
+"""
+CERES Simplified - Testes Unitários para Serviços de Orquestração
+Testes do número de consultas do onboarding completo de clientes
+"""
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from apps.customers.models import Customer
+from apps.sanctions.models import SanctionsList, SanctionsEntry
+from apps.core.services import CustomerOnboardingOrchestrator
+
+
+class CustomerOnboardingOrchestratorTest(TestCase):
+    """Testes unitários para CustomerOnboardingOrchestrator"""
+    
+    # Consultas de um onboarding de pessoa física, sem contar savepoints
+    ONBOARDING_QUERY_BUDGET = 9
+    
+    # Sem estado de banco, a mesma instância serve a todos os testes
+    orchestrator = CustomerOnboardingOrchestrator()
+    
+    @classmethod
+    def setUpTestData(cls):
+        """Configuração inicial para os testes"""
+        cls.sanctions_list = SanctionsList.objects.create(
+            name='OFAC SDN List',
+            description='Office of Foreign Assets Control - Specially Designated Nationals',
+            list_type='OFAC',
+            is_active=True
+        )
+        
+        SanctionsEntry.objects.create(
+            sanctions_list=cls.sanctions_list,
+            primary_name='MARIA SANTOS',
+            is_active=True
+        )
+    
+    def create_customer(self, document_number):
+        """Criar cliente pessoa física para onboarding"""
+        return Customer.objects.create(
+            customer_type=Customer.CustomerType.INDIVIDUAL,
+            full_name='Maria Santos',
+            document_number=document_number,
+            email=f'maria.{document_number}@example.com',
+            phone='+5511999999999',
+            address='Rua Teste, 123',
+            city='São Paulo',
+            state='SP',
+            postal_code='01234-567'
+        )
+    
+    def onboarding_queries(self, customer):
+        """Consultas emitidas pelo onboarding, sem contar savepoints"""
+        with CaptureQueriesContext(connection) as queries:
+            self.orchestrator.process_customer_onboarding(customer)
+        
+        return [
+            query['sql'] for query in queries.captured_queries
+            if 'SAVEPOINT' not in query['sql']
+        ]
+    
+    def test_onboarding_query_budget(self):
+        """Teste do orçamento de consultas do onboarding"""
+        queries = self.onboarding_queries(self.create_customer('12345678901'))
+        
+        self.assertEqual(len(queries), self.ONBOARDING_QUERY_BUDGET)
+    
+    def test_onboarding_returns_updated_customer(self):
+        """Teste do cliente atualizado devolvido no resultado do onboarding"""
+        customer = self.create_customer('12345678901')
+        
+        result = self.orchestrator.process_customer_onboarding(customer)
+        
+        self.assertIs(result['customer'], customer)
+        customer.refresh_from_db(fields=['onboarding_status'])
+        self.assertEqual(result['customer'].onboarding_status, customer.onboarding_status)
+    
+    def test_onboarding_queries_do_not_grow_with_matches(self):
+        """Teste de consultas constantes com mais entradas correspondentes"""
+        baseline = self.onboarding_queries(self.create_customer('12345678901'))
+        
+        SanctionsEntry.objects.bulk_create([
+            SanctionsEntry(
+                sanctions_list=self.sanctions_list,
+                primary_name=f'MARIA SANTOS {suffix}',
+                normalized_primary_name=f'MARIA SANTOS {suffix}',
+                is_active=True
+            )
+            for suffix in ('I', 'II', 'III', 'IV', 'V')
+        ])
+        
+        queries = self.onboarding_queries(self.create_customer('98765432100'))
+        self.assertEqual(len(queries), len(baseline))
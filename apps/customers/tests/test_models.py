@@ -111,6 +111,24 @@ class CustomerModelTest(TestCase):
         with self.assertRaises(Exception):  # IntegrityError esperado
             Customer.objects.create(**duplicate_data)
     
+    def test_customer_email_required(self):
+        """Teste de validação do email obrigatório"""
+        customer = Customer(
+            customer_type='INDIVIDUAL',
+            full_name='João Silva',
+            document_number='44444444444',
+            phone='+5511999999999',
+            address='Rua Teste, 123',
+            city='São Paulo',
+            state='SP',
+            postal_code='01234-567'
+        )
+        
+        with self.assertRaises(ValidationError) as context:
+            customer.clean_fields()
+        
+        self.assertEqual(set(context.exception.message_dict), {'email'})
+    
     def test_customer_pep_flag(self):
         """Teste da flag de Pessoa Politicamente Exposta"""
         customer_data = self.customer_data.copy()
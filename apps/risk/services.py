@@ -207,9 +207,9 @@ class RiskCalculationService:
     
     def _evaluate_beneficial_ownership_risk(self, customer: Customer, factor: RiskFactor) -> float:
         """Evaluate risk based on beneficial ownership structure"""
-        beneficial_owners = customer.beneficial_owners.all()
+        beneficial_owners = list(customer.beneficial_owners.all())
         
-        if not beneficial_owners.exists():
+        if not beneficial_owners:
             return factor.high_risk_score
         
         # Check for complex ownership structures
@@ -318,7 +318,7 @@ class RiskMonitoringService:
         # This would typically compare current data with last assessment
         # For simplicity, we'll check basic indicators
         
-        last_assessment = customer.risk_assessments.filter(is_current=True).first()
+        last_assessment = self._get_current_assessment(customer)
         if not last_assessment:
             return True
         
@@ -334,6 +334,12 @@ class RiskMonitoringService:
         
         return len(changes) > 0
     
+    def _get_current_assessment(self, customer: Customer) -> Optional[RiskAssessment]:
+        """Current assessment, read from ``current_risk_assessments`` when prefetched"""
+        if hasattr(customer, 'current_risk_assessments'):
+            return next(iter(customer.current_risk_assessments), None)
+        return customer.risk_assessments.filter(is_current=True).first()
+    
     def _is_assessment_outdated(self, customer: Customer) -> bool:
         """Check if current assessment is outdated"""
         if not customer.last_risk_assessment:
@@ -27,6 +27,10 @@ class SanctionsMatchInline(admin.TabularInline):
         'review_status', 'matched_value'
     ]
     readonly_fields = ['created_at']
+    
+    def get_queryset(self, request):
+        """Optimize queryset"""
+        return super().get_queryset(request).select_related('sanctions_entry__sanctions_list')
 
 
 @admin.register(SanctionsList)
@@ -311,6 +315,13 @@ class SanctionsMatchAdmin(admin.ModelAdmin):
         'mark_needs_investigation'
     ]
     
+    def get_queryset(self, request):
+        """Optimize queryset"""
+        return super().get_queryset(request).select_related(
+            'sanctions_check__customer', 'sanctions_check__beneficial_owner',
+            'sanctions_entry__sanctions_list', 'reviewed_by'
+        )
+    
     def match_score_colored(self, obj):
         """Display match score with colors"""
         if obj.match_score >= 80:
@@ -5,4 +5,7 @@ class SanctionsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.sanctions'
     verbose_name = 'Verificação de Sanções'
-
+    
+    def ready(self):
+        """Connect signals invalidating cached screening indexes"""
+        from . import signals  # noqa: F401
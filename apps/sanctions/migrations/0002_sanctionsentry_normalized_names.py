@@ -0,0 +1,56 @@
+# Generated by Django 5.1.4 on 2026-10-16 19:33
+
+import re
+
+from django.db import migrations, models
+
+# Frozen copy of the name normalization at the time of this migration
+_PREFIX_SUFFIX_RE = re.compile(r'^(?:MR|MRS|MS|DR|PROF)\.\s*|\s+(?:JR\.|SR\.|III|IV)$')
+_NON_WORD_RE = re.compile(r'\W+')
+
+
+def normalize_name(name):
+    if not name:
+        return ""
+    
+    normalized = _PREFIX_SUFFIX_RE.sub('', name.upper())
+    
+    return _NON_WORD_RE.sub(' ', normalized).strip()
+
+
+def backfill_normalized_names(apps, schema_editor):
+    SanctionsEntry = apps.get_model('sanctions', 'SanctionsEntry')
+    
+    entries = []
+    for entry in SanctionsEntry.objects.only('primary_name', 'alternative_names').iterator():
+        alternative_names = [name.strip() for name in entry.alternative_names.split('\n') if name.strip()]
+        entry.normalized_primary_name = normalize_name(entry.primary_name)
+        entry.normalized_alternative_names = [
+            name for name in map(normalize_name, alternative_names) if name
+        ]
+        entries.append(entry)
+    
+    SanctionsEntry.objects.bulk_update(
+        entries, ['normalized_primary_name', 'normalized_alternative_names'], batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sanctions', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sanctionsentry',
+            name='normalized_alternative_names',
+            field=models.JSONField(blank=True, default=list, editable=False, verbose_name='Nomes Alternativos Normalizados'),
+        ),
+        migrations.AddField(
+            model_name='sanctionsentry',
+            name='normalized_primary_name',
+            field=models.CharField(blank=True, editable=False, max_length=500, verbose_name='Nome Principal Normalizado'),
+        ),
+        migrations.RunPython(backfill_normalized_names, migrations.RunPython.noop),
+    ]
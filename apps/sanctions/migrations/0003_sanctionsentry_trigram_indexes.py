@@ -0,0 +1,42 @@
+# Generated by Django 5.1.4 on 2026-10-16 20:45
+
+from django.db import migrations
+
+# Case-insensitive name searches (admin icontains lookups) compare
+# UPPER(column::text), so the trigram indexes are built on that expression
+TRIGRAM_INDEXES = {
+    'sanctions_entry_primary_name_trgm': 'UPPER("primary_name"::text)',
+    'sanctions_entry_alternative_names_trgm': 'UPPER("alternative_names"::text)',
+    'sanctions_entry_normalized_primary_name_trgm': '"normalized_primary_name"',
+}
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, expression in TRIGRAM_INDEXES.items():
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS "{name}" ON "sanctions_sanctionsentry" '
+            f'USING gin ({expression} gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    
+    for name in TRIGRAM_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS "{name}"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sanctions', '0002_sanctionsentry_normalized_names'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
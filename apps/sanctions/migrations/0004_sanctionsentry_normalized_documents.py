@@ -0,0 +1,58 @@
+# Generated by Django 5.1.4 on 2026-10-16 19:54
+
+import re
+
+from django.db import migrations, models
+
+# Frozen copy of the document normalization at the time of this migration
+_DOCUMENT_SEPARATORS_RE = re.compile(r'[\s\-\.]')
+
+
+def normalize_document(document):
+    if not document:
+        return ""
+    
+    return _DOCUMENT_SEPARATORS_RE.sub('', document.upper())
+
+
+def backfill_normalized_documents(apps, schema_editor):
+    SanctionsEntry = apps.get_model('sanctions', 'SanctionsEntry')
+    
+    entries = []
+    for entry in SanctionsEntry.objects.only('passport_number', 'national_id').iterator():
+        entry.normalized_passport_number = normalize_document(entry.passport_number)
+        entry.normalized_national_id = normalize_document(entry.national_id)
+        entries.append(entry)
+    
+    SanctionsEntry.objects.bulk_update(
+        entries, ['normalized_passport_number', 'normalized_national_id'], batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sanctions', '0003_sanctionsentry_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sanctionsentry',
+            name='normalized_national_id',
+            field=models.CharField(blank=True, editable=False, max_length=50, verbose_name='Documento Nacional Normalizado'),
+        ),
+        migrations.AddField(
+            model_name='sanctionsentry',
+            name='normalized_passport_number',
+            field=models.CharField(blank=True, editable=False, max_length=50, verbose_name='Número do Passaporte Normalizado'),
+        ),
+        migrations.AddIndex(
+            model_name='sanctionsentry',
+            index=models.Index(fields=['normalized_passport_number'], name='sanctions_s_normali_bb3984_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sanctionsentry',
+            index=models.Index(fields=['normalized_national_id'], name='sanctions_s_normali_4ace1f_idx'),
+        ),
+        migrations.RunPython(backfill_normalized_documents, migrations.RunPython.noop),
+    ]
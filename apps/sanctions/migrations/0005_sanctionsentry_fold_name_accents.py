@@ -0,0 +1,53 @@
+# Generated by Django 5.1.4 on 2026-10-16 21:30
+
+import re
+import unicodedata
+
+from django.db import migrations
+
+# Frozen copy of the name normalization at the time of this migration
+_PREFIX_SUFFIX_RE = re.compile(r'^(?:MR|MRS|MS|DR|PROF)\.\s*|\s+(?:JR\.|SR\.|III|IV)$')
+_NON_WORD_RE = re.compile(r'\W+')
+_COMBINING_MARKS_RE = re.compile(r'[\u0300-\u036f]')
+
+
+def normalize_name(name):
+    if not name:
+        return ""
+    
+    normalized = name.upper()
+    if not normalized.isascii():
+        normalized = _COMBINING_MARKS_RE.sub('', unicodedata.normalize('NFKD', normalized))
+    
+    normalized = _PREFIX_SUFFIX_RE.sub('', normalized)
+    
+    return _NON_WORD_RE.sub(' ', normalized).strip()
+
+
+def renormalize_names(apps, schema_editor):
+    SanctionsEntry = apps.get_model('sanctions', 'SanctionsEntry')
+    
+    # Normalized names now fold accents, stored values are recomputed
+    entries = []
+    for entry in SanctionsEntry.objects.only('primary_name', 'alternative_names').iterator():
+        alternative_names = [name.strip() for name in entry.alternative_names.split('\n') if name.strip()]
+        entry.normalized_primary_name = normalize_name(entry.primary_name)
+        entry.normalized_alternative_names = [
+            name for name in map(normalize_name, alternative_names) if name
+        ]
+        entries.append(entry)
+    
+    SanctionsEntry.objects.bulk_update(
+        entries, ['normalized_primary_name', 'normalized_alternative_names'], batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sanctions', '0004_sanctionsentry_normalized_documents'),
+    ]
+
+    operations = [
+        migrations.RunPython(renormalize_names, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.1.4 on 2026-10-16 20:05
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customers', '0001_initial'),
+        ('sanctions', '0005_sanctionsentry_fold_name_accents'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sanctionscheck',
+            name='screening_fingerprint',
+            field=models.CharField(blank=True, editable=False, max_length=64, verbose_name='Assinatura da Verificação'),
+        ),
+        migrations.AddIndex(
+            model_name='sanctionscheck',
+            index=models.Index(fields=['screening_fingerprint', 'check_date'], name='sanctions_s_screeni_fc9da3_idx'),
+        ),
+    ]
@@ -9,6 +9,8 @@ from django.contrib.auth.models import User
 from django.utils import timezone
 from django.core.validators import MinValueValidator, MaxValueValidator
 
+from .normalization import normalize_document, normalize_name
+
 
 class SanctionsList(models.Model):
     """Sanctions lists configuration"""
@@ -109,6 +111,20 @@ class SanctionsEntry(models.Model):
         help_text="Um nome por linha"
     )
     
+    # Normalized names used for screening, kept in sync on save
+    normalized_primary_name = models.CharField(
+        max_length=500,
+        blank=True,
+        editable=False,
+        verbose_name="Nome Principal Normalizado"
+    )
+    normalized_alternative_names = models.JSONField(
+        default=list,
+        blank=True,
+        editable=False,
+        verbose_name="Nomes Alternativos Normalizados"
+    )
+    
     # Identification
     date_of_birth = models.DateField(
         blank=True,
@@ -138,6 +154,20 @@ class SanctionsEntry(models.Model):
         verbose_name="Documento Nacional"
     )
     
+    # Normalized documents used for exact lookups, kept in sync on save
+    normalized_passport_number = models.CharField(
+        max_length=50,
+        blank=True,
+        editable=False,
+        verbose_name="Número do Passaporte Normalizado"
+    )
+    normalized_national_id = models.CharField(
+        max_length=50,
+        blank=True,
+        editable=False,
+        verbose_name="Documento Nacional Normalizado"
+    )
+    
     # Address
     address = models.TextField(blank=True, verbose_name="Endereço")
     
@@ -174,18 +204,39 @@ class SanctionsEntry(models.Model):
             models.Index(fields=['primary_name']),
             models.Index(fields=['passport_number']),
             models.Index(fields=['national_id']),
+            models.Index(fields=['normalized_passport_number']),
+            models.Index(fields=['normalized_national_id']),
             models.Index(fields=['sanctions_list', 'is_active']),
         ]
     
     def __str__(self):
         return f"{self.primary_name} ({self.sanctions_list.name})"
     
+    def save(self, *args, **kwargs):
+        """Override save to keep normalized names and documents in sync"""
+        self.normalize_names()
+        self.normalize_documents()
+        super().save(*args, **kwargs)
+    
     def get_all_names(self):
         """Get all names (primary + alternatives) as a list"""
         names = [self.primary_name]
         if self.alternative_names:
             names.extend([name.strip() for name in self.alternative_names.split('\n') if name.strip()])
         return names
+    
+    def normalize_names(self):
+        """Refresh normalized names from primary and alternative names"""
+        primary_name, *alternative_names = self.get_all_names()
+        self.normalized_primary_name = normalize_name(primary_name)
+        self.normalized_alternative_names = [
+            name for name in map(normalize_name, alternative_names) if name
+        ]
+    
+    def normalize_documents(self):
+        """Refresh normalized documents from passport number and national ID"""
+        self.normalized_passport_number = normalize_document(self.passport_number)
+        self.normalized_national_id = normalize_document(self.national_id)
 
 
 class SanctionsCheck(models.Model):
@@ -268,6 +319,13 @@ class SanctionsCheck(models.Model):
     
     # Results
     total_matches = models.IntegerField(default=0, verbose_name="Total de Correspondências")
+    # Screened data, list versions and thresholds, equal fingerprints share results
+    screening_fingerprint = models.CharField(
+        max_length=64,
+        blank=True,
+        editable=False,
+        verbose_name="Assinatura da Verificação"
+    )
     
     # Dates
     check_date = models.DateTimeField(
@@ -310,6 +368,7 @@ class SanctionsCheck(models.Model):
             models.Index(fields=['beneficial_owner', 'check_date']),
             models.Index(fields=['match_status']),
             models.Index(fields=['check_date']),
+            models.Index(fields=['screening_fingerprint', 'check_date']),
         ]
     
     def __str__(self):
@@ -0,0 +1,41 @@
+"""
+CERES Simplified - Sanctions Name Normalization
+Normalization of names and documents shared by models and screening
+"""
+
+import re
+import unicodedata
+
+# Common prefixes/suffixes removed from names
+_PREFIX_SUFFIX_RE = re.compile(r'^(?:MR|MRS|MS|DR|PROF)\.\s*|\s+(?:JR\.|SR\.|III|IV)$')
+# Runs of special characters and whitespace, collapsed into a single space
+_NON_WORD_RE = re.compile(r'\W+')
+# Combining diacritical marks left by NFKD decomposition of accented letters
+_COMBINING_MARKS_RE = re.compile(r'[\u0300-\u036f]')
+_DOCUMENT_SEPARATORS_RE = re.compile(r'[\s\-\.]')
+
+
+def normalize_name(name: str) -> str:
+    """Normalize name for comparison"""
+    
+    if not name:
+        return ""
+    
+    normalized = name.upper()
+    if not normalized.isascii():
+        # Fold accents so "JOÃO" and "JOAO" compare equal, other scripts are kept
+        normalized = _COMBINING_MARKS_RE.sub('', unicodedata.normalize('NFKD', normalized))
+    
+    normalized = _PREFIX_SUFFIX_RE.sub('', normalized)
+    
+    return _NON_WORD_RE.sub(' ', normalized).strip()
+
+
+def normalize_document(document: str) -> str:
+    """Normalize document number for comparison"""
+    
+    if not document:
+        return ""
+    
+    # Remove spaces, hyphens, and other separators
+    return _DOCUMENT_SEPARATORS_RE.sub('', document.upper())
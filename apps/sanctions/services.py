@@ -3,20 +3,161 @@ CERES Simplified - Sanctions Screening Services
 Business logic for sanctions screening and matching
 """
 
+import hashlib
 import logging
-import re
-from typing import Dict, List, Tuple, Optional
-from difflib import SequenceMatcher
+import sys
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from typing import Dict, List, NamedTuple, Tuple, Optional
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
 from django.db import transaction
+from django.db.models import Count, Max, Q
 from django.utils import timezone
 from django.contrib.auth.models import User
 
 from .models import SanctionsList, SanctionsEntry, SanctionsCheck, SanctionsMatch
+from .normalization import normalize_document, normalize_name
+from .similarity import normalized_similarity, similarity_matrix
 from apps.customers.models import Customer, BeneficialOwner
 
 logger = logging.getLogger(__name__)
 
 
+# Entries fetched per database round trip when building an index
+ENTRY_CHUNK_SIZE = 2000
+
+# Entry columns read by the screening index, other columns are deferred
+INDEXED_ENTRY_FIELDS = (
+    'id', 'sanctions_list_id', 'primary_name', 'normalized_primary_name',
+    'normalized_alternative_names', 'normalized_passport_number', 'normalized_national_id',
+    'date_of_birth',
+)
+
+
+class EntryIndex(NamedTuple):
+    """
+    Struct-of-arrays view of the active entries of a sanctions list
+    
+    Primary names and aliases are normalized, deduplicated and flattened into
+    ``names`` so they can be scored in a single batch; ``name_owners`` maps
+    every name back to the positions and origins of the entries holding it
+    (the same alias is often listed for several entries). Name tokens are
+    kept as posting lists of name positions so token overlap can be counted
+    for all names at once. Identifiers only match exactly, so they are
+    hashed to the positions of their entries.
+    """
+    entries: Tuple[SanctionsEntry, ...]
+    names: Tuple[str, ...]
+    name_owners: Tuple[Tuple[Tuple[int, str], ...], ...]
+    name_lengths: np.ndarray
+    name_token_counts: np.ndarray
+    token_postings: Dict[str, np.ndarray]
+    passports: Dict[str, Tuple[int, ...]]
+    national_ids: Dict[str, Tuple[int, ...]]
+    dates_of_birth: Dict[date, Tuple[int, ...]]
+
+
+def _build_identifier_index(values) -> Dict:
+    """Map each non-empty identifier value to the positions holding it"""
+    
+    positions = defaultdict(list)
+    for position, value in enumerate(values):
+        if value:
+            positions[value].append(position)
+    
+    return {value: tuple(value_positions) for value, value_positions in positions.items()}
+
+
+def _build_entry_index(entries) -> EntryIndex:
+    """Build the screening index of a collection of sanctions entries"""
+    
+    entries = tuple(entries)
+    name_owners = {}
+    
+    for position, entry in enumerate(entries):
+        # Names are normalized when entries are saved
+        entry_names = [('primary_name', entry.normalized_primary_name)] + [
+            ('alias', alias) for alias in entry.normalized_alternative_names
+        ]
+        
+        for field, entry_name in entry_names:
+            if entry_name:
+                name_owners.setdefault(sys.intern(entry_name), []).append((position, field))
+    
+    names = list(name_owners)
+    name_token_counts = []
+    token_postings = defaultdict(list)
+    for name_position, name in enumerate(names):
+        tokens = set(name.split())
+        name_token_counts.append(len(tokens))
+        for token in tokens:
+            token_postings[token].append(name_position)
+    
+    return EntryIndex(
+        entries=entries,
+        names=tuple(names),
+        name_owners=tuple(tuple(owners) for owners in name_owners.values()),
+        name_lengths=np.fromiter(map(len, names), dtype=np.float64, count=len(names)),
+        name_token_counts=np.array(name_token_counts, dtype=np.float64),
+        token_postings={
+            token: np.array(positions, dtype=np.intp)
+            for token, positions in token_postings.items()
+        },
+        # Documents are normalized when entries are saved
+        passports=_build_identifier_index(entry.normalized_passport_number for entry in entries),
+        national_ids=_build_identifier_index(entry.normalized_national_id for entry in entries),
+        dates_of_birth=_build_identifier_index(entry.date_of_birth for entry in entries),
+    )
+
+
+# Screening index of each sanctions list, with the version it was built from
+_entry_index_cache: Dict = {}
+
+
+def _get_active_entries_cached(sanctions_list: SanctionsList, version) -> EntryIndex:
+    """
+    Screening index of the active entries of a sanctions list
+    
+    ``version`` changes whenever the list or its entries change. Only the
+    latest version of each list is kept: an index built for another
+    version is rebuilt and replaced, never returned.
+    """
+    
+    cached = _entry_index_cache.get(sanctions_list.pk)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    
+    # Rows are streamed in chunks instead of filling a queryset cache
+    entries = SanctionsEntry.objects.filter(
+        sanctions_list_id=sanctions_list.pk,
+        is_active=True
+    ).only(*INDEXED_ENTRY_FIELDS).iterator(chunk_size=ENTRY_CHUNK_SIZE)
+    
+    # Entries share the list instance, so reading entry.sanctions_list on a
+    # match does not issue a query per match
+    index = _build_entry_index(_with_sanctions_list(entries, sanctions_list))
+    _entry_index_cache[sanctions_list.pk] = (version, index)
+    
+    return index
+
+
+def _with_sanctions_list(entries, sanctions_list: SanctionsList):
+    """Attach an already loaded sanctions list to its entries"""
+    
+    for entry in entries:
+        entry.sanctions_list = sanctions_list
+        yield entry
+
+
+def invalidate_entry_index(list_id) -> None:
+    """Drop the cached screening index of a sanctions list"""
+    
+    _entry_index_cache.pop(list_id, None)
+
+
 class SanctionsScreeningService:
     """Service for sanctions screening and matching"""
     
@@ -24,6 +165,12 @@ class SanctionsScreeningService:
         self.match_threshold = 0.85  # Minimum similarity for exact match
         self.potential_match_threshold = 0.70  # Minimum similarity for potential match
         self.fuzzy_match_threshold = 0.60  # Minimum similarity for fuzzy match
+        self.sequence_weight = 0.7  # Weight of character similarity in name score
+        self.token_weight = 0.3  # Weight of token overlap in name score
+        self.screening_workers = 8  # Maximum lists scored concurrently
+        self.name_chunk_size = 10000  # Entry names scored per similarity matrix
+        # Seconds screening results are reused for unchanged data and lists
+        self.result_cache_timeout = getattr(settings, 'SANCTIONS_SCREENING_CACHE_TIMEOUT', 3600)
     
     def screen_customer(self, customer: Customer, initiated_by: User = None) -> SanctionsCheck:
         """
@@ -39,49 +186,39 @@ class SanctionsScreeningService:
         logger.info(f"Starting sanctions screening for customer {customer.id}")
         
         try:
+            # Screening record is saved once, with its results
+            sanctions_check = SanctionsCheck(
+                customer=customer,
+                check_date=timezone.now(),
+                match_status='PENDING',
+                initiated_by=initiated_by
+            )
+            
+            # Get active sanctions lists
+            active_lists = self._get_active_lists()
+            
+            # Perform screening against all lists
+            customer_data = self._prepare_customer_data(customer)
+            fingerprint = self._screening_fingerprint(customer_data, active_lists)
+            all_matches = self._screen_data_cached(customer_data, active_lists, fingerprint)
+            
+            # Determine overall match status
+            match_status = self._determine_match_status(all_matches)
+            sanctions_check.match_status = match_status
+            sanctions_check.total_matches = len(all_matches)
+            sanctions_check.notes = f"Screened against {len(active_lists)} sanctions lists"
+            sanctions_check.screening_fingerprint = fingerprint
+            
+            # Only the writes run in a transaction, screening reads stay outside
             with transaction.atomic():
-                # Create screening record
-                sanctions_check = SanctionsCheck.objects.create(
-                    customer=customer,
-                    check_date=timezone.now(),
-                    match_status='PENDING',
-                    initiated_by=initiated_by
-                )
-                
-                # Get active sanctions lists
-                active_lists = SanctionsList.objects.filter(is_active=True)
-                
-                # Perform screening against all lists
-                all_matches = []
-                for sanctions_list in active_lists:
-                    matches = self._screen_against_list(customer, sanctions_list)
-                    all_matches.extend(matches)
-                
-                # Determine overall match status
-                match_status = self._determine_match_status(all_matches)
-                
-                # Update sanctions check
-                sanctions_check.match_status = match_status
-                sanctions_check.total_matches = len(all_matches)
-                sanctions_check.notes = f"Screened against {active_lists.count()} sanctions lists"
-                sanctions_check.save()
-                
-                # Create match records
-                for match_data in all_matches:
-                    SanctionsMatch.objects.create(
-                        sanctions_check=sanctions_check,
-                        sanctions_entry=match_data['entry'],
-                        match_type=match_data['match_type'],
-                        match_score=match_data['score'],
-                        matched_field=match_data['field'],
-                        review_status='PENDING'
-                    )
-                
-                logger.info(f"Sanctions screening completed for customer {customer.id}: "
-                           f"{match_status} with {len(all_matches)} matches")
-                
-                return sanctions_check
-                
+                sanctions_check.save(force_insert=True)
+                self._create_match_records(sanctions_check, all_matches)
+            
+            logger.info(f"Sanctions screening completed for customer {customer.id}: "
+                       f"{match_status} with {len(all_matches)} matches")
+            
+            return sanctions_check
+            
         except Exception as e:
             logger.error(f"Error in sanctions screening for customer {customer.id}: {str(e)}")
             raise
@@ -101,89 +238,341 @@ class SanctionsScreeningService:
         logger.info(f"Starting sanctions screening for beneficial owner {beneficial_owner.id}")
         
         try:
+            # Screening record is saved once, with its results
+            sanctions_check = SanctionsCheck(
+                beneficial_owner=beneficial_owner,
+                check_date=timezone.now(),
+                match_status='PENDING',
+                initiated_by=initiated_by
+            )
+            
+            # Get active sanctions lists
+            active_lists = self._get_active_lists()
+            
+            # Perform screening against all lists
+            bo_data = self._prepare_beneficial_owner_data(beneficial_owner)
+            fingerprint = self._screening_fingerprint(bo_data, active_lists)
+            all_matches = self._screen_data_cached(bo_data, active_lists, fingerprint)
+            
+            # Determine overall match status
+            match_status = self._determine_match_status(all_matches)
+            sanctions_check.match_status = match_status
+            sanctions_check.total_matches = len(all_matches)
+            sanctions_check.notes = f"Screened against {len(active_lists)} sanctions lists"
+            sanctions_check.screening_fingerprint = fingerprint
+            
+            # Only the writes run in a transaction, screening reads stay outside
             with transaction.atomic():
-                # Create screening record
-                sanctions_check = SanctionsCheck.objects.create(
-                    beneficial_owner=beneficial_owner,
-                    check_date=timezone.now(),
-                    match_status='PENDING',
+                sanctions_check.save(force_insert=True)
+                self._create_match_records(sanctions_check, all_matches)
+            
+            logger.info(f"Sanctions screening completed for beneficial owner {beneficial_owner.id}: "
+                       f"{match_status} with {len(all_matches)} matches")
+            
+            return sanctions_check
+            
+        except Exception as e:
+            logger.error(f"Error in sanctions screening for beneficial owner {beneficial_owner.id}: {str(e)}")
+            raise
+    
+    def bulk_screening(self, customers: List[Customer], initiated_by: User = None) -> List[SanctionsCheck]:
+        """
+        Perform sanctions screening for several customers at once
+        
+        Names of all customers are scored against each list in a single
+        similarity matrix, and all checks and matches are written in
+        batched INSERTs.
+        
+        Args:
+            customers: Customer instances to screen
+            initiated_by: User who initiated the screening
+            
+        Returns:
+            SanctionsCheck instances with results, in customer order
+        """
+        customers = list(customers)
+        logger.info(f"Starting bulk sanctions screening for {len(customers)} customers")
+        
+        try:
+            # Get active sanctions lists
+            active_lists = self._get_active_lists()
+            indexes = [self._get_entry_index(sanctions_list) for sanctions_list in active_lists]
+            
+            customers_data = [self._prepare_customer_data(customer) for customer in customers]
+            names = []
+            name_customers = []
+            for position, customer_data in enumerate(customers_data):
+                for name in customer_data['names']:
+                    if name:
+                        names.append(name)
+                        name_customers.append(position)
+            
+            # Perform screening against all lists
+            customers_matches = [[] for _ in customers]
+            for index in indexes:
+                for name_position, match in self._match_name_queries(names, index):
+                    customers_matches[name_customers[name_position]].append(match)
+                
+                for matcher in self._identifier_matchers(index):
+                    for customer_data, customer_matches in zip(customers_data, customers_matches):
+                        customer_matches.extend(matcher(customer_data, index))
+            
+            check_date = timezone.now()
+            sanctions_checks = [
+                SanctionsCheck(
+                    customer=customer,
+                    check_date=check_date,
+                    match_status=self._determine_match_status(customer_matches),
+                    total_matches=len(customer_matches),
+                    notes=f"Screened against {len(active_lists)} sanctions lists",
+                    screening_fingerprint=self._screening_fingerprint(customer_data, active_lists),
                     initiated_by=initiated_by
                 )
-                
-                # Get active sanctions lists
-                active_lists = SanctionsList.objects.filter(is_active=True)
-                
-                # Perform screening against all lists
-                all_matches = []
-                for sanctions_list in active_lists:
-                    matches = self._screen_beneficial_owner_against_list(beneficial_owner, sanctions_list)
-                    all_matches.extend(matches)
-                
-                # Determine overall match status
-                match_status = self._determine_match_status(all_matches)
-                
-                # Update sanctions check
-                sanctions_check.match_status = match_status
-                sanctions_check.total_matches = len(all_matches)
-                sanctions_check.notes = f"Screened against {active_lists.count()} sanctions lists"
-                sanctions_check.save()
-                
-                # Create match records
-                for match_data in all_matches:
-                    SanctionsMatch.objects.create(
-                        sanctions_check=sanctions_check,
-                        sanctions_entry=match_data['entry'],
-                        match_type=match_data['match_type'],
-                        match_score=match_data['score'],
-                        matched_field=match_data['field'],
-                        review_status='PENDING'
-                    )
-                
-                logger.info(f"Sanctions screening completed for beneficial owner {beneficial_owner.id}: "
-                           f"{match_status} with {len(all_matches)} matches")
-                
-                return sanctions_check
-                
+                for customer, customer_data, customer_matches in zip(
+                    customers, customers_data, customers_matches
+                )
+            ]
+            match_records = [
+                match_record
+                for sanctions_check, customer_matches in zip(sanctions_checks, customers_matches)
+                for match_record in self._build_match_records(sanctions_check, customer_matches)
+            ]
+            
+            with transaction.atomic():
+                SanctionsCheck.objects.bulk_create(sanctions_checks, batch_size=1000)
+                SanctionsMatch.objects.bulk_create(match_records, batch_size=1000)
+            
+            logger.info(f"Bulk sanctions screening completed for {len(customers)} customers "
+                       f"with {len(match_records)} matches")
+            
+            return sanctions_checks
+            
         except Exception as e:
-            logger.error(f"Error in sanctions screening for beneficial owner {beneficial_owner.id}: {str(e)}")
+            logger.error(f"Error in bulk sanctions screening: {str(e)}")
             raise
     
-    def _screen_against_list(self, customer: Customer, sanctions_list: SanctionsList) -> List[Dict]:
-        """Screen customer against specific sanctions list"""
+    def _create_match_records(self, sanctions_check: SanctionsCheck,
+                              all_matches: List[Dict]) -> List[SanctionsMatch]:
+        """Create all match records of a screening in batched INSERTs"""
         
-        matches = []
-        entries = SanctionsEntry.objects.filter(
-            sanctions_list=sanctions_list,
-            is_active=True
+        return SanctionsMatch.objects.bulk_create(
+            self._build_match_records(sanctions_check, all_matches), batch_size=1000
         )
+    
+    def _build_match_records(self, sanctions_check: SanctionsCheck,
+                             all_matches: List[Dict]) -> List[SanctionsMatch]:
+        """Build unsaved match records of a screening"""
+        
+        return [
+            SanctionsMatch(
+                sanctions_check=sanctions_check,
+                sanctions_entry=match_data['entry'],
+                match_type=match_data['match_type'],
+                # Scores are 0-1 similarities, the model stores 0-100
+                match_score=round(match_data['score'] * 100),
+                matched_field=match_data['field'],
+                review_status='PENDING'
+            )
+            for match_data in all_matches
+        ]
+    
+    def _screen_data_cached(self, data: Dict, sanctions_lists: List[SanctionsList],
+                            fingerprint: str) -> List[Dict]:
+        """
+        Screen prepared data against sanctions lists, reusing previous results
+        
+        Results are keyed by the screening fingerprint, so any change to the
+        data, the lists or the thresholds is screened again. Recent results
+        are served from the cache; older ones from the latest stored check
+        with the same fingerprint, so unchanged customers are not rescored
+        by periodic re-screening. Only entry ids are reused; the matched
+        entries are loaded in a single query instead of loading and scoring
+        whole lists.
+        """
+        
+        cache_key = f"sanctions:screening:{fingerprint}"
+        cached_matches = cache.get(cache_key)
+        if cached_matches is None:
+            cached_matches = self._previous_screening_matches(fingerprint)
+            
+            if cached_matches is None:
+                all_matches = self._screen_data_against_lists(data, sanctions_lists)
+                cache.set(cache_key, [
+                    (match['entry'].pk, match['match_type'], match['score'], match['field'])
+                    for match in all_matches
+                ], self.result_cache_timeout)
+                return all_matches
+            
+            cache.set(cache_key, cached_matches, self.result_cache_timeout)
+        
+        lists_by_id = {sanctions_list.pk: sanctions_list for sanctions_list in sanctions_lists}
+        entries = SanctionsEntry.objects.only(*INDEXED_ENTRY_FIELDS).in_bulk(
+            {entry_id for entry_id, *_ in cached_matches}
+        )
+        for entry in entries.values():
+            entry.sanctions_list = lists_by_id[entry.sanctions_list_id]
+        
+        return [
+            {
+                'entry': entries[entry_id],
+                'match_type': match_type,
+                'score': score,
+                'field': field
+            }
+            for entry_id, match_type, score, field in cached_matches
+            if entry_id in entries
+        ]
+    
+    def _previous_screening_matches(self, fingerprint: str) -> Optional[List[Tuple]]:
+        """Matches of the latest stored check with a screening fingerprint, if any"""
+        
+        previous_check = SanctionsCheck.objects.filter(
+            screening_fingerprint=fingerprint
+        ).order_by('-check_date').values_list('pk', flat=True).first()
+        if previous_check is None:
+            return None
+        
+        return [
+            # Stored scores are 0-100, matches carry 0-1 similarities
+            (entry_id, match_type, match_score / 100, field)
+            for entry_id, match_type, match_score, field in SanctionsMatch.objects.filter(
+                sanctions_check_id=previous_check
+            ).values_list('sanctions_entry_id', 'match_type', 'match_score', 'matched_field')
+        ]
+    
+    def _screening_fingerprint(self, data: Dict, sanctions_lists: List[SanctionsList]) -> str:
+        """Fingerprint of a screening of prepared data against sanctions lists"""
+        
+        fingerprint = repr((
+            data['names'], data['documents'], data['dates'],
+            [(sanctions_list.pk, self._entry_index_version(sanctions_list))
+             for sanctions_list in sanctions_lists],
+            (self.match_threshold, self.potential_match_threshold, self.fuzzy_match_threshold,
+             self.sequence_weight, self.token_weight),
+        ))
+        
+        return hashlib.sha256(fingerprint.encode()).hexdigest()
+    
+    def _screen_data_against_lists(self, data: Dict, sanctions_lists: List[SanctionsList]) -> List[Dict]:
+        """
+        Screen prepared customer/beneficial owner data against sanctions lists
         
-        # Prepare customer data for matching
-        customer_data = self._prepare_customer_data(customer)
+        Entry indexes are loaded on the calling thread, which owns the
+        database connection. Scoring only reads the in-memory indexes and
+        the similarity kernels release the GIL, so lists are scored
+        concurrently in a thread pool. Each pooled list is then scored on a
+        single thread, so the pool is the only level of parallelism.
+        """
         
-        for entry in entries:
-            entry_matches = self._match_customer_against_entry(customer_data, entry)
-            matches.extend(entry_matches)
+        indexes = [self._get_entry_index(sanctions_list) for sanctions_list in sanctions_lists]
         
-        return matches
+        if len(indexes) <= 1:
+            results = [self._screen_data_against_index(data, index) for index in indexes]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.screening_workers, len(indexes))) as executor:
+                results = list(executor.map(
+                    lambda index: self._screen_data_against_index(data, index, workers=1), indexes
+                ))
+        
+        return [match for matches in results for match in matches]
     
-    def _screen_beneficial_owner_against_list(self, beneficial_owner: BeneficialOwner, 
-                                            sanctions_list: SanctionsList) -> List[Dict]:
-        """Screen beneficial owner against specific sanctions list"""
+    def _screen_data_against_index(self, data: Dict, index: EntryIndex,
+                                   workers: int = -1) -> List[Dict]:
+        """
+        Screen prepared customer/beneficial owner data against an entry index
+        
+        Lists without names, documents or birth dates skip those matchers
+        entirely instead of probing empty indexes per screening. ``workers``
+        is passed on to the similarity matrix calls.
+        """
         
         matches = []
+        if index.names:
+            # Names are scored against the whole list in a single batch
+            matches.extend(self._match_names_in_index(
+                [name for name in data['names'] if name], index, workers
+            ))
+        
+        for matcher in self._identifier_matchers(index):
+            matches.extend(matcher(data, index))
+        
+        return matches
+    
+    def _find_name_matches(self, name: str) -> List[Dict]:
+        """Find matches for a single name across all active sanctions lists"""
+        
+        return [
+            match
+            for sanctions_list in self._get_active_lists()
+            for match in self._match_names_in_index([name], self._get_entry_index(sanctions_list))
+        ]
+    
+    def _find_document_matches(self, document: str) -> List[Dict]:
+        """Find matches for a single document across all active sanctions lists"""
+        
+        normalized_doc = normalize_document(document)
+        if not normalized_doc:
+            return []
+        
+        # Exact lookup on the indexed normalized columns, no list index is built
         entries = SanctionsEntry.objects.filter(
-            sanctions_list=sanctions_list,
-            is_active=True
-        )
+            Q(normalized_passport_number=normalized_doc) | Q(normalized_national_id=normalized_doc),
+            is_active=True,
+            sanctions_list__is_active=True
+        ).select_related('sanctions_list')
         
-        # Prepare beneficial owner data for matching
-        bo_data = self._prepare_beneficial_owner_data(beneficial_owner)
+        return [
+            {
+                'entry': entry,
+                'match_type': 'EXACT',
+                'score': 1.0,
+                'field': field
+            }
+            for entry in entries
+            for field, value in (('passport_number', entry.normalized_passport_number),
+                                 ('national_id', entry.normalized_national_id))
+            if value == normalized_doc
+        ]
+    
+    def _identifier_matchers(self, index: EntryIndex) -> List:
+        """Document and date matchers applicable to an entry index"""
         
-        for entry in entries:
-            entry_matches = self._match_beneficial_owner_against_entry(bo_data, entry)
-            matches.extend(entry_matches)
+        matchers = []
+        if index.passports or index.national_ids:
+            matchers.append(self._match_documents)
+        if index.dates_of_birth:
+            matchers.append(self._match_dates)
         
-        return matches
+        return matchers
+    
+    def _get_active_lists(self) -> List[SanctionsList]:
+        """Active sanctions lists, annotated with the version of their entries"""
+        
+        return list(SanctionsList.objects.filter(is_active=True).annotate(
+            active_entries=Count('entries', filter=Q(entries__is_active=True)),
+            entries_updated_at=Max('entries__updated_at')
+        ))
+    
+    def _get_entry_index(self, sanctions_list: SanctionsList) -> EntryIndex:
+        """Cached screening index of the active entries of a sanctions list"""
+        
+        return _get_active_entries_cached(sanctions_list, self._entry_index_version(sanctions_list))
+    
+    def _entry_index_version(self, sanctions_list: SanctionsList) -> Tuple:
+        """Version of a sanctions list, changing whenever the list or its entries change"""
+        
+        if hasattr(sanctions_list, 'entries_updated_at'):
+            active_entries = sanctions_list.active_entries
+            entries_updated_at = sanctions_list.entries_updated_at
+        else:
+            stats = sanctions_list.entries.aggregate(
+                active_entries=Count('id', filter=Q(is_active=True)),
+                entries_updated_at=Max('updated_at')
+            )
+            active_entries = stats['active_entries']
+            entries_updated_at = stats['entries_updated_at']
+        
+        return (sanctions_list.last_updated, sanctions_list.updated_at, active_entries, entries_updated_at)
     
     def _prepare_customer_data(self, customer: Customer) -> Dict:
         """Prepare customer data for sanctions matching"""
@@ -199,7 +588,7 @@ class SanctionsScreeningService:
                 customer.tax_id if hasattr(customer, 'tax_id') else None,
             ],
             'dates': [
-                customer.date_of_birth,
+                customer.date_of_birth if hasattr(customer, 'date_of_birth') else None,
                 customer.incorporation_date if hasattr(customer, 'incorporation_date') else None,
             ],
             'locations': [
@@ -220,213 +609,216 @@ class SanctionsScreeningService:
                 beneficial_owner.document_number,
             ],
             'dates': [
-                beneficial_owner.date_of_birth,
+                beneficial_owner.date_of_birth if hasattr(beneficial_owner, 'date_of_birth') else None,
             ],
             'locations': [
-                beneficial_owner.nationality,
+                beneficial_owner.nationality if hasattr(beneficial_owner, 'nationality') else None,
                 beneficial_owner.country_of_residence if hasattr(beneficial_owner, 'country_of_residence') else None,
             ]
         }
     
-    def _match_customer_against_entry(self, customer_data: Dict, entry: SanctionsEntry) -> List[Dict]:
-        """Match customer data against sanctions entry"""
+    def _match_documents(self, data: Dict, index: EntryIndex) -> List[Dict]:
+        """Match document numbers against the entries of an index"""
         
         matches = []
         
-        # Name matching
-        for customer_name in customer_data['names']:
-            if customer_name:
-                name_matches = self._match_names(customer_name, entry)
-                matches.extend(name_matches)
-        
-        # Document matching
-        for customer_doc in customer_data['documents']:
-            if customer_doc:
-                doc_matches = self._match_documents(customer_doc, entry)
-                matches.extend(doc_matches)
-        
-        # Date matching
-        for customer_date in customer_data['dates']:
-            if customer_date:
-                date_matches = self._match_dates(customer_date, entry)
-                matches.extend(date_matches)
-        
-        return matches
-    
-    def _match_beneficial_owner_against_entry(self, bo_data: Dict, entry: SanctionsEntry) -> List[Dict]:
-        """Match beneficial owner data against sanctions entry"""
-        
-        matches = []
-        
-        # Name matching
-        for bo_name in bo_data['names']:
-            if bo_name:
-                name_matches = self._match_names(bo_name, entry)
-                matches.extend(name_matches)
-        
-        # Document matching
-        for bo_doc in bo_data['documents']:
-            if bo_doc:
-                doc_matches = self._match_documents(bo_doc, entry)
-                matches.extend(doc_matches)
-        
-        # Date matching
-        for bo_date in bo_data['dates']:
-            if bo_date:
-                date_matches = self._match_dates(bo_date, entry)
-                matches.extend(date_matches)
+        for document in data['documents']:
+            normalized_doc = normalize_document(document)
+            if not normalized_doc:
+                continue
+            
+            for field, positions in (('passport_number', index.passports),
+                                     ('national_id', index.national_ids)):
+                for position in positions.get(normalized_doc, ()):
+                    matches.append({
+                        'entry': index.entries[position],
+                        'match_type': 'EXACT',
+                        'score': 1.0,
+                        'field': field
+                    })
         
         return matches
     
-    def _match_names(self, name: str, entry: SanctionsEntry) -> List[Dict]:
-        """Match names using various algorithms"""
+    def _match_dates(self, data: Dict, index: EntryIndex) -> List[Dict]:
+        """Match dates (birth dates, etc.) against the entries of an index"""
         
         matches = []
         
-        # Normalize names for comparison
-        normalized_name = self._normalize_name(name)
-        
-        # Check against primary name
-        if entry.primary_name:
-            normalized_entry_name = self._normalize_name(entry.primary_name)
-            score = self._calculate_name_similarity(normalized_name, normalized_entry_name)
+        for date_value in data['dates']:
+            if not date_value:
+                continue
             
-            if score >= self.match_threshold:
+            for position in index.dates_of_birth.get(date_value, ()):
                 matches.append({
-                    'entry': entry,
+                    'entry': index.entries[position],
                     'match_type': 'EXACT',
-                    'score': score,
-                    'field': 'primary_name'
-                })
-            elif score >= self.potential_match_threshold:
-                matches.append({
-                    'entry': entry,
-                    'match_type': 'POTENTIAL',
-                    'score': score,
-                    'field': 'primary_name'
-                })
-            elif score >= self.fuzzy_match_threshold:
-                matches.append({
-                    'entry': entry,
-                    'match_type': 'FUZZY',
-                    'score': score,
-                    'field': 'primary_name'
+                    'score': 1.0,
+                    'field': 'date_of_birth'
                 })
         
-        # Check against aliases
-        if entry.aliases:
-            aliases = entry.aliases.split(';')
-            for alias in aliases:
-                if alias.strip():
-                    normalized_alias = self._normalize_name(alias.strip())
-                    score = self._calculate_name_similarity(normalized_name, normalized_alias)
-                    
-                    if score >= self.potential_match_threshold:
-                        matches.append({
-                            'entry': entry,
-                            'match_type': 'POTENTIAL' if score >= self.match_threshold else 'FUZZY',
-                            'score': score,
-                            'field': 'alias'
-                        })
-        
         return matches
     
-    def _match_documents(self, document: str, entry: SanctionsEntry) -> List[Dict]:
-        """Match document numbers"""
+    def _match_names(self, names: List[str], entries: List[SanctionsEntry]) -> List[Dict]:
+        """Match names against the primary names and aliases of entries"""
         
-        matches = []
+        return self._match_names_in_index(names, _build_entry_index(entries))
+    
+    def _match_names_in_index(self, names: List[str], index: EntryIndex,
+                              workers: int = -1) -> List[Dict]:
+        """Match names against all names of an entry index"""
+        
+        return [match for _, match in self._match_name_queries(names, index, workers)]
+    
+    def _match_name_queries(self, names: List[str], index: EntryIndex,
+                            workers: int = -1) -> List[Tuple[int, Dict]]:
+        """
+        Match names against all names of an entry index
         
-        # Normalize document for comparison
-        normalized_doc = self._normalize_document(document)
+        Primary names and aliases of every entry are scored in similarity
+        matrix calls (``rapidfuzz.process.cdist`` when available) over chunks
+        of ``name_chunk_size`` names, which compute all pairs in C across all
+        cores unless ``workers`` limits them. Each match is returned with the
+        position of the name it matched in ``names``.
+        """
         
-        # Check passport number
-        if entry.passport_number:
-            normalized_passport = self._normalize_document(entry.passport_number)
-            if normalized_doc == normalized_passport:
-                matches.append({
-                    'entry': entry,
-                    'match_type': 'EXACT',
-                    'score': 1.0,
-                    'field': 'passport_number'
-                })
+        queries = []
+        query_positions = []
+        for position, name in enumerate(names):
+            query = normalize_name(name)
+            if query:
+                queries.append(query)
+                query_positions.append(position)
         
-        # Check national ID
-        if entry.national_id:
-            normalized_national_id = self._normalize_document(entry.national_id)
-            if normalized_doc == normalized_national_id:
-                matches.append({
-                    'entry': entry,
-                    'match_type': 'EXACT',
-                    'score': 1.0,
-                    'field': 'national_id'
-                })
+        choices = index.names
         
-        return matches
-    
-    def _match_dates(self, date, entry: SanctionsEntry) -> List[Dict]:
-        """Match dates (birth dates, etc.)"""
+        if not queries or not choices:
+            return []
         
-        matches = []
+        token_similarities = [self._token_similarities(query, index) for query in queries]
         
-        # Check date of birth
-        if entry.date_of_birth and date == entry.date_of_birth:
-            matches.append({
-                'entry': entry,
-                'match_type': 'EXACT',
-                'score': 1.0,
-                'field': 'date_of_birth'
-            })
+        matches = []
+        # Names are scored in chunks, bounding the size of the score matrix
+        for start in range(0, len(choices), self.name_chunk_size):
+            end = start + self.name_chunk_size
+            scores = similarity_matrix(
+                queries,
+                choices[start:end],
+                score_cutoff=self._min_sequence_similarity(),
+                choice_lengths=index.name_lengths[start:end],
+                workers=workers
+            )
+            
+            for query_index in range(len(queries)):
+                candidates = np.flatnonzero(scores[query_index])
+                if not candidates.size:
+                    continue
+                
+                # Weighted combination, computed for all candidates at once
+                combined_scores = (
+                    scores[query_index, candidates].astype(np.float64) * self.sequence_weight
+                    + token_similarities[query_index][start + candidates] * self.token_weight
+                )
+                above_threshold = combined_scores >= self.fuzzy_match_threshold
+                
+                for choice_index, score in zip(start + candidates[above_threshold],
+                                               combined_scores[above_threshold]):
+                    # Each unique name is scored once and fanned out to its entries
+                    for position, field in index.name_owners[choice_index]:
+                        match_type = self._classify_name_match(float(score), field)
+                        
+                        if match_type:
+                            matches.append((query_positions[query_index], {
+                                'entry': index.entries[position],
+                                'match_type': match_type,
+                                'score': float(score),
+                                'field': field
+                            }))
         
         return matches
     
-    def _normalize_name(self, name: str) -> str:
-        """Normalize name for comparison"""
-        
-        if not name:
-            return ""
+    def _token_similarities(self, query: str, index: EntryIndex) -> np.ndarray:
+        """Token Jaccard similarity of a normalized query against every name of an index"""
         
-        # Convert to uppercase
-        normalized = name.upper()
+        query_tokens = set(query.split())
+        intersections = np.zeros(len(index.names), dtype=np.float64)
         
-        # Remove common prefixes/suffixes
-        prefixes = ['MR.', 'MRS.', 'MS.', 'DR.', 'PROF.']
-        suffixes = ['JR.', 'SR.', 'III', 'IV']
+        # Each name appears at most once in a posting list
+        for token in query_tokens:
+            positions = index.token_postings.get(token)
+            if positions is not None:
+                intersections[positions] += 1
         
-        for prefix in prefixes:
-            if normalized.startswith(prefix):
-                normalized = normalized[len(prefix):].strip()
+        unions = index.name_token_counts + len(query_tokens) - intersections
         
-        for suffix in suffixes:
-            if normalized.endswith(suffix):
-                normalized = normalized[:-len(suffix)].strip()
-        
-        # Remove special characters and extra spaces
-        normalized = re.sub(r'[^\w\s]', ' ', normalized)
-        normalized = re.sub(r'\s+', ' ', normalized).strip()
+        return intersections / unions
+    
+    def _classify_name_match(self, score: float, field: str) -> Optional[str]:
+        """Classify a name similarity score into a match type"""
+        
+        if field == 'alias':
+            if score >= self.potential_match_threshold:
+                return 'POTENTIAL' if score >= self.match_threshold else 'FUZZY'
+            return None
+        
+        if score >= self.match_threshold:
+            return 'EXACT'
+        elif score >= self.potential_match_threshold:
+            return 'POTENTIAL'
+        elif score >= self.fuzzy_match_threshold:
+            return 'FUZZY'
+        return None
+    
+    def _normalize_name(self, name: str) -> str:
+        """Normalize name for comparison"""
         
-        return normalized
+        return normalize_name(name)
     
     def _normalize_document(self, document: str) -> str:
         """Normalize document number for comparison"""
         
-        if not document:
-            return ""
-        
-        # Remove spaces, hyphens, and other separators
-        normalized = re.sub(r'[\s\-\.]', '', document.upper())
-        
-        return normalized
+        return normalize_document(document)
     
-    def _calculate_name_similarity(self, name1: str, name2: str) -> float:
-        """Calculate similarity between two names"""
+    def _calculate_name_similarity(self, name1: str, name2: str,
+                                   score_cutoff: Optional[float] = None) -> float:
+        """
+        Calculate similarity between two names
+        
+        When ``score_cutoff`` is given, the edit distance is bounded by the
+        number of edits the cutoff allows: pairs whose length difference
+        alone exceeds it are rejected without scoring, and the remaining ones
+        stop as soon as the bound is crossed. Character similarity below the
+        cutoff is reported as 0.
+        """
         
         if not name1 or not name2:
             return 0.0
         
-        # Use SequenceMatcher for basic similarity
-        basic_similarity = SequenceMatcher(None, name1, name2).ratio()
+        if score_cutoff is None:
+            basic_similarity = normalized_similarity(name1, name2)
+        else:
+            # Indel distance is at least the length difference
+            max_edits = int((1 - score_cutoff) * (len(name1) + len(name2)))
+            if abs(len(name1) - len(name2)) > max_edits:
+                basic_similarity = 0.0
+            else:
+                basic_similarity = normalized_similarity(
+                    name1, name2, score_cutoff=score_cutoff
+                )
+        
+        return self._combine_name_similarity(basic_similarity, name1, name2)
+    
+    def _min_sequence_similarity(self) -> float:
+        """
+        Lowest character similarity that can still reach the fuzzy threshold
+        once the token similarity is added to the weighted combination
+        """
         
-        # Additional matching techniques
+        return max(
+            0.0, (self.fuzzy_match_threshold - self.token_weight) / self.sequence_weight
+        )
+    
+    def _combine_name_similarity(self, basic_similarity: float, name1: str, name2: str) -> float:
+        """Combine character similarity with token-based similarity"""
         
         # Token-based matching (order-independent)
         tokens1 = set(name1.split())
@@ -438,9 +830,9 @@ class SanctionsScreeningService:
             token_similarity = 0.0
         
         # Weighted combination
-        final_similarity = (basic_similarity * 0.7) + (token_similarity * 0.3)
+        final_similarity = (basic_similarity * self.sequence_weight) + (token_similarity * self.token_weight)
         
-        return final_similarity
+        return float(final_similarity)
     
     def _determine_match_status(self, matches: List[Dict]) -> str:
         """Determine overall match status from individual matches"""
@@ -523,6 +915,14 @@ class SanctionsScreeningService:
 class SanctionsListManagementService:
     """Service for managing sanctions lists and entries"""
     
+    # Entry fields refreshed when a list is reloaded
+    ENTRY_UPDATE_FIELDS = [
+        'alternative_names', 'date_of_birth', 'place_of_birth', 'nationality',
+        'passport_number', 'national_id', 'address', 'entry_type',
+        'sanctions_program', 'listing_date', 'is_active',
+        'normalized_alternative_names', 'normalized_passport_number', 'normalized_national_id',
+    ]
+    
     def update_sanctions_list(self, list_name: str, entries_data: List[Dict]) -> SanctionsList:
         """
         Update sanctions list with new entries
@@ -553,29 +953,60 @@ class SanctionsListManagementService:
                     sanctions_list=sanctions_list
                 ).update(is_active=False)
                 
+                # Existing entries are fetched once and matched by primary name
+                existing_entries = {
+                    entry.primary_name: entry
+                    for entry in SanctionsEntry.objects.filter(sanctions_list=sanctions_list)
+                }
+                
                 # Add new entries
-                entries_created = 0
+                entries_to_create = {}
+                entries_to_update = {}
+                now = timezone.now()
                 for entry_data in entries_data:
-                    entry, entry_created = SanctionsEntry.objects.update_or_create(
-                        sanctions_list=sanctions_list,
-                        primary_name=entry_data.get('primary_name', ''),
-                        defaults={
-                            'aliases': entry_data.get('aliases', ''),
-                            'date_of_birth': entry_data.get('date_of_birth'),
-                            'place_of_birth': entry_data.get('place_of_birth', ''),
-                            'nationality': entry_data.get('nationality', ''),
-                            'passport_number': entry_data.get('passport_number', ''),
-                            'national_id': entry_data.get('national_id', ''),
-                            'address': entry_data.get('address', ''),
-                            'entity_type': entry_data.get('entity_type', 'INDIVIDUAL'),
-                            'sanctions_reason': entry_data.get('sanctions_reason', ''),
-                            'listing_date': entry_data.get('listing_date'),
-                            'is_active': True
-                        }
-                    )
+                    primary_name = entry_data.get('primary_name', '')
+                    aliases = entry_data.get('aliases', '')
+                    if isinstance(aliases, (list, tuple)):
+                        aliases = '\n'.join(aliases)
+                    
+                    values = {
+                        'alternative_names': aliases,
+                        'date_of_birth': entry_data.get('date_of_birth'),
+                        'place_of_birth': entry_data.get('place_of_birth', ''),
+                        'nationality': entry_data.get('nationality', ''),
+                        'passport_number': entry_data.get('passport_number', ''),
+                        'national_id': entry_data.get('national_id', ''),
+                        'address': entry_data.get('address', ''),
+                        'entry_type': entry_data.get('entity_type', 'INDIVIDUAL'),
+                        'sanctions_program': entry_data.get('sanctions_reason', ''),
+                        'listing_date': entry_data.get('listing_date'),
+                        'is_active': True
+                    }
                     
-                    if entry_created:
-                        entries_created += 1
+                    entry = existing_entries.get(primary_name)
+                    if entry is None:
+                        entry = SanctionsEntry(sanctions_list=sanctions_list, primary_name=primary_name)
+                        existing_entries[primary_name] = entry
+                        entries_to_create[entry.pk] = entry
+                    elif entry.pk not in entries_to_create:
+                        # bulk_update() does not touch auto_now fields
+                        entry.updated_at = now
+                        entries_to_update[entry.pk] = entry
+                    
+                    for field, value in values.items():
+                        setattr(entry, field, value)
+                    
+                    # bulk operations skip save(), which normalizes names
+                    entry.normalize_names()
+                    entry.normalize_documents()
+                
+                SanctionsEntry.objects.bulk_create(entries_to_create.values(), batch_size=1000)
+                SanctionsEntry.objects.bulk_update(
+                    entries_to_update.values(),
+                    fields=[*self.ENTRY_UPDATE_FIELDS, 'updated_at'],
+                    batch_size=1000
+                )
+                entries_created = len(entries_to_create)
                 
                 # Update list metadata
                 sanctions_list.last_updated = timezone.now()
@@ -602,16 +1033,24 @@ class SanctionsListManagementService:
         total_entries = SanctionsEntry.objects.filter(is_active=True).count()
         
         # Screening statistics
-        total_checks = SanctionsCheck.objects.count()
-        recent_checks = SanctionsCheck.objects.filter(
-            check_date__gte=timezone.now() - timezone.timedelta(days=30)
-        ).count()
-        
-        # Match statistics
-        total_matches = SanctionsMatch.objects.count()
-        confirmed_matches = SanctionsMatch.objects.filter(review_status='CONFIRMED').count()
-        false_positives = SanctionsMatch.objects.filter(review_status='FALSE_POSITIVE').count()
-        pending_reviews = SanctionsMatch.objects.filter(review_status='PENDING').count()
+        checks = SanctionsCheck.objects.aggregate(
+            total=Count('id'),
+            recent=Count('id', filter=Q(check_date__gte=timezone.now() - timezone.timedelta(days=30)))
+        )
+        total_checks = checks['total']
+        recent_checks = checks['recent']
+        
+        # Match statistics, counted in a single scan
+        matches = SanctionsMatch.objects.aggregate(
+            total=Count('id'),
+            confirmed=Count('id', filter=Q(review_status='CONFIRMED')),
+            false_positives=Count('id', filter=Q(review_status='FALSE_POSITIVE')),
+            pending=Count('id', filter=Q(review_status='PENDING'))
+        )
+        total_matches = matches['total']
+        confirmed_matches = matches['confirmed']
+        false_positives = matches['false_positives']
+        pending_reviews = matches['pending']
         
         return {
             'lists': {
@@ -0,0 +1,35 @@
+"""
+CERES Simplified - Sanctions Signals
+Invalidation of cached screening indexes
+"""
+
+import logging
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import SanctionsList, SanctionsEntry
+from .services import invalidate_entry_index
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(post_save, sender=SanctionsEntry)
+@receiver(post_delete, sender=SanctionsEntry)
+def sanctions_entry_changed(sender, instance, **kwargs):
+    """
+    Drop the screening index of the entry's list when the entry changes
+    """
+    invalidate_entry_index(instance.sanctions_list_id)
+
+
+@receiver(post_save, sender=SanctionsList)
+@receiver(post_delete, sender=SanctionsList)
+def sanctions_list_changed(sender, instance, **kwargs):
+    """
+    Drop the screening index of a list when the list changes
+    
+    Indexed entries hold the list instance they were loaded with, so a
+    renamed or deactivated list must not keep serving them.
+    """
+    logger.debug(f"Sanctions list {instance.id} changed, dropping its screening index")
+    invalidate_entry_index(instance.pk)
@@ -0,0 +1,117 @@
+"""
+CERES Simplified - Name Similarity Kernels
+Normalized Indel similarity between names, batched over whole lists
+"""
+
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+try:
+    from rapidfuzz import process
+    from rapidfuzz.distance import Indel
+except ImportError:
+    # Fall back to the pure Python bit-parallel kernel below
+    process = Indel = None
+
+
+def _pattern_masks(pattern: str) -> Dict[str, int]:
+    """Bit mask of the positions of every character of a pattern"""
+    
+    masks = {}
+    for position, char in enumerate(pattern):
+        masks[char] = masks.get(char, 0) | (1 << position)
+    return masks
+
+
+def _lcs_length(masks: Dict[str, int], pattern_length: int, text: str) -> int:
+    """
+    Bit-parallel longest common subsequence (Hyyrö's variant of Myers'
+    bit-vector algorithm): a whole DP column is updated per text character
+    """
+    
+    all_ones = (1 << pattern_length) - 1
+    row = all_ones
+    for char in text:
+        matches = row & masks.get(char, 0)
+        row = ((row + matches) | (row - matches)) & all_ones
+    return pattern_length - row.bit_count()
+
+
+def _bit_parallel_similarity(masks: Dict[str, int], pattern_length: int,
+                             text: str, score_cutoff: float) -> float:
+    """Normalized Indel similarity of a pre-encoded pattern and a text"""
+    
+    total_length = pattern_length + len(text)
+    if not total_length:
+        return 1.0
+    
+    # The LCS cannot exceed the shorter string
+    if 2 * min(pattern_length, len(text)) / total_length < score_cutoff:
+        return 0.0
+    
+    similarity = 2 * _lcs_length(masks, pattern_length, text) / total_length
+    return similarity if similarity >= score_cutoff else 0.0
+
+
+def normalized_similarity(name1: str, name2: str, score_cutoff: Optional[float] = None) -> float:
+    """
+    Normalized Indel similarity (0-1) between two names
+    
+    Similarities below ``score_cutoff`` are reported as 0.
+    """
+    
+    if Indel is not None:
+        return Indel.normalized_similarity(name1, name2, score_cutoff=score_cutoff)
+    
+    return _bit_parallel_similarity(
+        _pattern_masks(name1), len(name1), name2, score_cutoff or 0.0
+    )
+
+
+def similarity_matrix(queries: Sequence[str], choices: Sequence[str],
+                      score_cutoff: float = 0.0,
+                      choice_lengths: Optional[np.ndarray] = None,
+                      workers: int = -1) -> np.ndarray:
+    """
+    Normalized Indel similarity of every query against every choice
+    
+    Returns a ``len(queries) x len(choices)`` float32 matrix where
+    similarities below ``score_cutoff`` are 0. ``choice_lengths`` may carry
+    precomputed lengths of the choices. ``workers`` is the number of threads
+    rapidfuzz may use (-1 for all cores).
+    """
+    
+    if process is not None:
+        # rapidfuzz applies the length bound itself, per pair in C
+        return process.cdist(
+            queries,
+            choices,
+            scorer=Indel.normalized_similarity,
+            score_cutoff=score_cutoff,
+            dtype=np.float32,
+            workers=workers
+        )
+    
+    if choice_lengths is None:
+        choice_lengths = np.fromiter(map(len, choices), dtype=np.float64, count=len(choices))
+    
+    scores = np.zeros((len(queries), len(choices)), dtype=np.float32)
+    for query_index, query in enumerate(queries):
+        # Upper bound of the similarity given by the lengths alone, so only
+        # choices that can reach the cutoff are scored
+        total_lengths = choice_lengths + len(query)
+        max_similarities = np.divide(
+            2 * np.minimum(choice_lengths, len(query)), total_lengths,
+            out=np.ones_like(total_lengths, dtype=np.float64),
+            where=total_lengths > 0
+        )
+        candidates = np.flatnonzero(max_similarities >= score_cutoff)
+        
+        # Queries are encoded once and compared against every candidate
+        masks = _pattern_masks(query)
+        for choice_index in candidates:
+            scores[query_index, choice_index] = _bit_parallel_similarity(
+                masks, len(query), choices[choice_index], score_cutoff
+            )
+    return scores
@@ -3,79 +3,102 @@ CERES Simplified - Fase 5: Testes Unitários para Serviços de Sanctions
 Testes abrangentes para validação de screening de sanções e matching
 """
 
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth.models import User
 from django.utils import timezone
 from unittest.mock import patch, MagicMock
+from datetime import date
 from decimal import Decimal
 
 from apps.customers.models import Customer, BeneficialOwner
 from apps.sanctions.models import SanctionsList, SanctionsEntry, SanctionsCheck
-from apps.sanctions.services import SanctionsScreeningService
+from apps.sanctions.services import (
+    SanctionsScreeningService, SanctionsListManagementService,
+    _entry_index_cache
+)
+from apps.sanctions import similarity
 
 
 class SanctionsScreeningServiceTest(TestCase):
     """Testes unitários para SanctionsScreeningService"""
     
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """Configuração inicial para os testes"""
-        self.user = User.objects.create_user(
+        cls.user = User.objects.create_user(
             username='testuser',
             email='test@example.com',
             password='testpass123'
         )
         
-        self.customer = Customer.objects.create(
+        cls.customer = Customer.objects.create(
             customer_type='INDIVIDUAL',
-            first_name='João',
-            last_name='Silva',
+            full_name='João Silva',
             email='joao.silva@email.com',
             phone='+5511999999999',
             document_type='CPF',
             document_number='12345678901',
+            address='Rua Teste, 123',
+            city='São Paulo',
+            state='SP',
+            postal_code='01234-567',
             country='Brasil'
         )
         
         # Criar lista de sanções para teste
-        self.sanctions_list = SanctionsList.objects.create(
+        cls.sanctions_list = SanctionsList.objects.create(
             name='OFAC SDN List',
             description='Office of Foreign Assets Control - Specially Designated Nationals',
+            list_type='OFAC',
             source_url='https://www.treasury.gov/ofac/downloads/sdn.xml',
             is_active=True
         )
         
         # Criar entradas de sanções para teste
-        self.sanctions_entries = [
-            SanctionsEntry.objects.create(
-                sanctions_list=self.sanctions_list,
-                name='SILVA, João',
-                aliases='João Silva;J. Silva',
-                document_number='12345678901',
-                country='Brasil',
+        entries = [
+            SanctionsEntry(
+                sanctions_list=cls.sanctions_list,
+                primary_name='SILVA, João',
+                alternative_names='João Silva\nJ. Silva',
+                national_id='12345678901',
+                nationality='Brasil',
                 entry_type='INDIVIDUAL',
                 is_active=True
             ),
-            SanctionsEntry.objects.create(
-                sanctions_list=self.sanctions_list,
-                name='SANTOS, Maria',
-                aliases='Maria Santos;M. Santos',
-                document_number='98765432100',
-                country='Brasil',
+            SanctionsEntry(
+                sanctions_list=cls.sanctions_list,
+                primary_name='SANTOS, Maria',
+                alternative_names='Maria Santos\nM. Santos',
+                national_id='98765432100',
+                nationality='Brasil',
                 entry_type='INDIVIDUAL',
                 is_active=True
             ),
-            SanctionsEntry.objects.create(
-                sanctions_list=self.sanctions_list,
-                name='Empresa Sancionada LTDA',
-                aliases='Empresa Sancionada;ES LTDA',
-                document_number='12345678000195',
-                country='Brasil',
+            SanctionsEntry(
+                sanctions_list=cls.sanctions_list,
+                primary_name='Empresa Sancionada LTDA',
+                alternative_names='Empresa Sancionada\nES LTDA',
+                national_id='12345678000195',
+                nationality='Brasil',
                 entry_type='ENTITY',
                 is_active=True
             )
         ]
         
-        self.service = SanctionsScreeningService()
+        # bulk_create() não chama save(), os campos normalizados são preenchidos aqui
+        for entry in entries:
+            entry.normalize_names()
+            entry.normalize_documents()
+        cls.sanctions_entries = SanctionsEntry.objects.bulk_create(entries)
+        
+        cls.service = SanctionsScreeningService()
+    
+    def setUp(self):
+        """Limpar o cache de resultados, que sobrevive entre os testes"""
+        cache.clear()
     
     def test_exact_name_match(self):
         """Teste de match exato por nome"""
@@ -284,22 +307,6 @@ class SanctionsScreeningServiceTest(TestCase):
         list_sources = set(match['list_name'] for match in result['matches'])
         self.assertGreaterEqual(len(list_sources), 1)
     
-    def test_screening_performance(self):
-        """Teste de performance do screening"""
-        import time
-        
-        start_time = time.time()
-        
-        # Executar múltiplos screenings
-        for _ in range(5):
-            self.service.screen_customer(self.customer, self.user)
-        
-        end_time = time.time()
-        execution_time = end_time - start_time
-        
-        # Verificar se execução é rápida (menos de 2 segundos para 5 screenings)
-        self.assertLess(execution_time, 2.0)
-    
     def test_screening_audit_trail(self):
         """Teste de trilha de auditoria do screening"""
         result = self.service.screen_customer(self.customer, self.user)
@@ -355,9 +362,8 @@ class SanctionsScreeningServiceTest(TestCase):
     def test_bulk_screening(self):
         """Teste de screening em lote"""
         # Criar múltiplos clientes
-        customers = []
-        for i in range(3):
-            customer = Customer.objects.create(
+        customers = Customer.objects.bulk_create([
+            Customer(
                 customer_type='INDIVIDUAL',
                 first_name=f'Cliente{i}',
                 last_name='Teste',
@@ -367,7 +373,8 @@ class SanctionsScreeningServiceTest(TestCase):
                 document_number=f'1234567890{i}',
                 country='Brasil'
             )
-            customers.append(customer)
+            for i in range(3)
+        ], batch_size=100)
         
         results = self.service.bulk_screening(customers, self.user)
         
@@ -382,9 +389,10 @@ class SanctionsScreeningServiceTest(TestCase):
 class SanctionsModelTest(TestCase):
     """Testes unitários para modelos de sanctions"""
     
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """Configuração inicial"""
-        self.sanctions_list = SanctionsList.objects.create(
+        cls.sanctions_list = SanctionsList.objects.create(
             name='Test List',
             description='Lista de teste',
             source_url='https://test.com',
@@ -419,3 +427,530 @@ class SanctionsModelTest(TestCase):
         expected_str = "Teste, João (Test List)"
         self.assertEqual(str(entry), expected_str)
 
+
+class SanctionsNameMatchingTest(TestCase):
+    """Testes do matching de nomes em lote contra listas de sanções"""
+    
+    @classmethod
+    def setUpTestData(cls):
+        """Configuração inicial"""
+        cls.sanctions_list = SanctionsList.objects.create(
+            name='OFAC SDN List',
+            description='Office of Foreign Assets Control - Specially Designated Nationals',
+            list_type='OFAC',
+            is_active=True
+        )
+        
+        cls.terrorist_entry = SanctionsEntry(
+            sanctions_list=cls.sanctions_list,
+            primary_name='JOHN TERRORIST',
+            alternative_names='JOHNNY TERROR\nJ. TERRORIST',
+            passport_number='AB123456',
+            is_active=True
+        )
+        
+        cls.drug_dealer_entry = SanctionsEntry(
+            sanctions_list=cls.sanctions_list,
+            primary_name='MARIA DRUGDEALER',
+            is_active=True
+        )
+        
+        # bulk_create() não chama save(), os campos normalizados são preenchidos aqui
+        for entry in (cls.terrorist_entry, cls.drug_dealer_entry):
+            entry.normalize_names()
+            entry.normalize_documents()
+        SanctionsEntry.objects.bulk_create([cls.terrorist_entry, cls.drug_dealer_entry])
+        
+        cls.customer = Customer.objects.create(
+            customer_type='INDIVIDUAL',
+            full_name='John Terrorist',
+            document_number='12345678901',
+            email='john@example.com',
+            phone='+5511999999999',
+            address='Rua Teste, 123',
+            city='São Paulo',
+            state='SP',
+            postal_code='01234-567'
+        )
+        
+        cls.service = SanctionsScreeningService()
+    
+    def setUp(self):
+        """Limpar o cache de resultados, que sobrevive entre os testes"""
+        cache.clear()
+    
+    def test_match_names_against_primary_names_and_aliases(self):
+        """Teste de matching de nomes principais e aliases em lote"""
+        entries = [self.terrorist_entry, self.drug_dealer_entry]
+        
+        matches = self.service._match_names(['Mr. John Terrorist'], entries)
+        
+        matched = {(match['entry'].id, match['field']): match for match in matches}
+        self.assertEqual(matched[(self.terrorist_entry.id, 'primary_name')]['match_type'], 'EXACT')
+        self.assertIn((self.terrorist_entry.id, 'alias'), matched)
+        self.assertNotIn(self.drug_dealer_entry.id, {match['entry'].id for match in matches})
+    
+    def test_match_names_in_chunks(self):
+        """Teste de matching de nomes processado em blocos"""
+        entries = [self.terrorist_entry, self.drug_dealer_entry]
+        expected = self.service._match_names(['Mr. John Terrorist'], entries)
+        
+        self.service.name_chunk_size = 1
+        matches = self.service._match_names(['Mr. John Terrorist'], entries)
+        
+        self.assertEqual(matches, expected)
+    
+    def test_entry_index_deduplicates_names(self):
+        """Teste de deduplicação de nomes compartilhados entre entradas"""
+        shared_alias_entry = SanctionsEntry.objects.create(
+            sanctions_list=self.sanctions_list,
+            primary_name='JOHNNY TERROR',
+            is_active=True
+        )
+        index = self.service._get_entry_index(self.sanctions_list)
+        
+        self.assertEqual(len(index.names), len(set(index.names)))
+        
+        matches = self.service._match_names_in_index(['Johnny Terror'], index)
+        matched = {(match['entry'].id, match['field']) for match in matches}
+        self.assertIn((shared_alias_entry.id, 'primary_name'), matched)
+        self.assertIn((self.terrorist_entry.id, 'alias'), matched)
+    
+    def test_find_name_and_document_matches(self):
+        """Teste de busca de nome e documento em todas as listas ativas"""
+        name_matches = self.service._find_name_matches('Jonh Terrorist')
+        document_matches = self.service._find_document_matches('AB 123456')
+        
+        self.assertIn(self.terrorist_entry.id, {match['entry'].id for match in name_matches})
+        self.assertEqual([match['entry'].id for match in document_matches], [self.terrorist_entry.id])
+        self.assertEqual(self.service._find_name_matches('Carlos Oliveira'), [])
+        self.assertEqual(self.service._find_document_matches('99999999999'), [])
+    
+    def test_find_document_matches_single_query(self):
+        """Teste de busca de documento em uma única consulta indexada"""
+        self.assertEqual(self.terrorist_entry.normalized_passport_number, 'AB123456')
+        
+        with self.assertNumQueries(1):
+            matches = self.service._find_document_matches('ab-123.456')
+            self.assertEqual(matches[0]['entry'].sanctions_list.name, self.sanctions_list.name)
+        
+        self.assertEqual(
+            [(match['entry'].id, match['field'], match['score']) for match in matches],
+            [(self.terrorist_entry.id, 'passport_number', 1.0)]
+        )
+        
+        self.sanctions_list.is_active = False
+        self.sanctions_list.save()
+        self.assertEqual(self.service._find_document_matches('AB123456'), [])
+    
+    def test_match_names_without_candidates(self):
+        """Teste de matching sem entradas ou nomes para comparar"""
+        self.assertEqual(self.service._match_names(['John Terrorist'], []), [])
+        self.assertEqual(self.service._match_names([], [self.terrorist_entry]), [])
+    
+    def test_screen_customer_records_matches(self):
+        """Teste de screening de cliente registrando as correspondências"""
+        sanctions_check = self.service.screen_customer(self.customer)
+        
+        self.assertEqual(sanctions_check.match_status, 'MATCH')
+        self.assertGreater(sanctions_check.total_matches, 0)
+        self.assertEqual(sanctions_check.matches.count(), sanctions_check.total_matches)
+        self.assertFalse(
+            sanctions_check.matches.filter(sanctions_entry=self.drug_dealer_entry).exists()
+        )
+    
+    def test_calculate_name_similarity_with_cutoff(self):
+        """Teste de similaridade limitada pelo score_cutoff"""
+        unbounded = self.service._calculate_name_similarity('JOHN TERRORIST', 'JOHN TERRORIS')
+        bounded = self.service._calculate_name_similarity(
+            'JOHN TERRORIST', 'JOHN TERRORIS', score_cutoff=0.5
+        )
+        self.assertEqual(bounded, unbounded)
+        
+        # Diferença de tamanho maior que o permitido descarta o par
+        self.assertEqual(
+            self.service._calculate_name_similarity('JO', 'MARIA DRUGDEALER', score_cutoff=0.5),
+            0.0
+        )
+    
+    def test_entry_index_cached_until_list_changes(self):
+        """Teste de cache do índice de entradas invalidado por alterações"""
+        index = self.service._get_entry_index(self.sanctions_list)
+        self.assertIs(self.service._get_entry_index(self.sanctions_list), index)
+        self.assertEqual(len(index.entries), 2)
+        
+        self.drug_dealer_entry.is_active = False
+        self.drug_dealer_entry.save()
+        
+        updated_index = self.service._get_entry_index(self.sanctions_list)
+        self.assertIsNot(updated_index, index)
+        self.assertEqual(
+            [entry.id for entry in updated_index.entries], [self.terrorist_entry.id]
+        )
+    
+    def test_entry_index_dropped_when_entries_change(self):
+        """Teste de descarte do índice em cache ao alterar entradas da lista"""
+        self.service._get_entry_index(self.sanctions_list)
+        self.assertIn(self.sanctions_list.id, _entry_index_cache)
+        
+        self.drug_dealer_entry.delete()
+        self.assertNotIn(self.sanctions_list.id, _entry_index_cache)
+        
+        index = self.service._get_entry_index(self.sanctions_list)
+        self.assertEqual([entry.id for entry in index.entries], [self.terrorist_entry.id])
+        self.assertIs(_entry_index_cache[self.sanctions_list.id][1], index)
+    
+    def test_entry_normalized_names_on_save(self):
+        """Teste de normalização dos nomes ao salvar a entrada"""
+        self.assertEqual(self.terrorist_entry.normalized_primary_name, 'JOHN TERRORIST')
+        self.assertEqual(
+            self.terrorist_entry.normalized_alternative_names,
+            ['JOHNNY TERROR', 'J TERRORIST']
+        )
+        
+        self.drug_dealer_entry.primary_name = 'Dr. José da Silva-Santos Jr.'
+        self.drug_dealer_entry.save()
+        self.drug_dealer_entry.refresh_from_db()
+        self.assertEqual(self.drug_dealer_entry.normalized_primary_name, 'JOSE DA SILVA SANTOS')
+        
+        matches = self.service._match_names_in_index(
+            ['Jose da Silva Santos'], self.service._get_entry_index(self.sanctions_list)
+        )
+        self.assertIn(
+            (self.drug_dealer_entry.id, 'primary_name', 'EXACT'),
+            {(match['entry'].id, match['field'], match['match_type']) for match in matches}
+        )
+    
+    def test_match_documents_and_dates_by_index(self):
+        """Teste de matching exato de documentos e datas pelo índice"""
+        self.drug_dealer_entry.date_of_birth = date(1970, 1, 1)
+        self.drug_dealer_entry.save()
+        index = self.service._get_entry_index(self.sanctions_list)
+        
+        data = {
+            'documents': ['ab-123.456', '99999999'],
+            'dates': [date(1970, 1, 1), None]
+        }
+        matches = self.service._match_documents(data, index) + self.service._match_dates(data, index)
+        
+        matched = {(match['entry'].id, match['field']) for match in matches}
+        self.assertEqual(matched, {
+            (self.terrorist_entry.id, 'passport_number'),
+            (self.drug_dealer_entry.id, 'date_of_birth'),
+        })
+    
+    def test_entry_index_entries_share_list(self):
+        """Teste de acesso à lista das entradas do índice sem consultas adicionais"""
+        index = self.service._get_entry_index(self.sanctions_list)
+        
+        with self.assertNumQueries(0):
+            matches = self.service._match_names_in_index(['John Terrorist'], index)
+            list_names = {match['entry'].sanctions_list.name for match in matches}
+        
+        self.assertEqual(list_names, {self.sanctions_list.name})
+        
+        self.sanctions_list.name = 'OFAC SDN'
+        self.sanctions_list.save()
+        index = self.service._get_entry_index(SanctionsList.objects.get(pk=self.sanctions_list.pk))
+        self.assertEqual(index.entries[0].sanctions_list.name, 'OFAC SDN')
+    
+    def test_screen_customer_reuses_cached_results(self):
+        """Teste de reaproveitamento do resultado em cache para dados e listas inalterados"""
+        first_check = self.service.screen_customer(self.customer)
+        
+        with patch.object(self.service, '_screen_data_against_lists') as screen:
+            second_check = self.service.screen_customer(self.customer)
+            screen.assert_not_called()
+        
+        self.assertNotEqual(first_check.id, second_check.id)
+        self.assertEqual(second_check.match_status, first_check.match_status)
+        self.assertEqual(
+            sorted(second_check.matches.values_list('sanctions_entry_id', 'match_score', 'matched_field')),
+            sorted(first_check.matches.values_list('sanctions_entry_id', 'match_score', 'matched_field'))
+        )
+        
+        self.terrorist_entry.alternative_names = ''
+        self.terrorist_entry.save()
+        with patch.object(self.service, '_screen_data_against_lists', return_value=[]) as screen:
+            self.service.screen_customer(self.customer)
+            screen.assert_called_once()
+    
+    def test_screen_customer_reuses_stored_check(self):
+        """Teste de reaproveitamento da última verificação gravada quando o cache expira"""
+        first_check = self.service.screen_customer(self.customer)
+        self.assertEqual(len(first_check.screening_fingerprint), 64)
+        cache.clear()
+        
+        with patch.object(self.service, '_screen_data_against_lists') as screen:
+            second_check = self.service.screen_customer(self.customer)
+            screen.assert_not_called()
+        
+        self.assertEqual(second_check.screening_fingerprint, first_check.screening_fingerprint)
+        self.assertEqual(second_check.match_status, first_check.match_status)
+        self.assertEqual(
+            sorted(second_check.matches.values_list('sanctions_entry_id', 'match_score', 'matched_field')),
+            sorted(first_check.matches.values_list('sanctions_entry_id', 'match_score', 'matched_field'))
+        )
+        
+        [bulk_check] = self.service.bulk_screening([self.customer])
+        self.assertEqual(bulk_check.screening_fingerprint, first_check.screening_fingerprint)
+    
+    def test_screening_query_budget(self):
+        """Teste do número de consultas do screening, independente do número de matches"""
+        def screening_queries():
+            with CaptureQueriesContext(connection) as queries:
+                for _ in range(5):
+                    self.service.screen_customer(self.customer)
+            return [
+                query['sql'] for query in queries.captured_queries
+                if not query['sql'].startswith(('SAVEPOINT', 'RELEASE SAVEPOINT'))
+            ]
+        
+        # Listas, verificação anterior, entradas, verificação e matches:
+        # no máximo cinco consultas por screening
+        self.assertLessEqual(len(screening_queries()), 5 * 5)
+        
+        SanctionsEntry.objects.bulk_create([
+            SanctionsEntry(
+                sanctions_list=self.sanctions_list,
+                primary_name=f'JOHN TERRORIST {suffix}',
+                normalized_primary_name=f'JOHN TERRORIST {suffix}',
+                is_active=True
+            )
+            for suffix in ('I', 'II', 'III')
+        ])
+        self.assertLessEqual(len(screening_queries()), 5 * 5)
+    
+    def test_entry_index_loads_only_indexed_fields(self):
+        """Teste de carga apenas das colunas usadas pelo índice"""
+        index = self.service._get_entry_index(self.sanctions_list)
+        
+        with self.assertNumQueries(0):
+            self.service._match_documents({'documents': ['AB123456'], 'dates': []}, index)
+            self.service._match_names_in_index(['John Terrorist'], index)
+        
+        self.assertIn('address', index.entries[0].get_deferred_fields())
+    
+    def test_screen_customer_saves_check_once(self):
+        """Teste de gravação única da verificação com os resultados"""
+        with CaptureQueriesContext(connection) as queries:
+            sanctions_check = self.service.screen_customer(self.customer)
+        
+        # A busca da última verificação com a mesma impressão digital é leitura
+        check_writes = [
+            query['sql'].split()[0] for query in queries.captured_queries
+            if 'sanctions_sanctionscheck' in query['sql'].split('(')[0]
+            and not query['sql'].startswith('SELECT')
+        ]
+        self.assertEqual(check_writes, ['INSERT'])
+        
+        sanctions_check.refresh_from_db()
+        self.assertEqual(sanctions_check.match_status, 'MATCH')
+        self.assertEqual(sanctions_check.total_matches, 2)
+    
+    def test_index_matchers_follow_list_contents(self):
+        """Teste de seleção dos matchers conforme os dados da lista"""
+        index = self.service._get_entry_index(self.sanctions_list)
+        
+        self.assertTrue(index.names)
+        self.assertEqual(self.service._identifier_matchers(index), [self.service._match_documents])
+    
+    def test_screen_customer_against_multiple_lists(self):
+        """Teste de screening concorrente contra múltiplas listas"""
+        un_list = SanctionsList.objects.create(
+            name='UN Consolidated List',
+            description='United Nations Security Council Consolidated List',
+            list_type='UN',
+            is_active=True
+        )
+        un_entry = SanctionsEntry.objects.create(
+            sanctions_list=un_list,
+            primary_name='JOHN TERRORIST',
+            is_active=True
+        )
+        
+        with patch('apps.sanctions.services.similarity_matrix',
+                   wraps=similarity.similarity_matrix) as matrix:
+            sanctions_check = self.service.screen_customer(self.customer)
+        
+        matched_entries = set(sanctions_check.matches.values_list('sanctions_entry', flat=True))
+        self.assertEqual(matched_entries, {self.terrorist_entry.id, un_entry.id})
+        self.assertEqual(sanctions_check.notes, 'Screened against 2 sanctions lists')
+        
+        # Listas em paralelo no pool, cada matriz de similaridade em uma única thread
+        self.assertEqual({call.kwargs['workers'] for call in matrix.call_args_list}, {1})
+    
+    def test_token_similarities_against_index(self):
+        """Teste de similaridade de tokens (Jaccard) vetorizada"""
+        index = self.service._get_entry_index(self.sanctions_list)
+        
+        similarities = self.service._token_similarities('JOHN TERROR MARIA', index)
+        
+        for name, token_similarity in zip(index.names, similarities):
+            tokens = set(name.split())
+            query_tokens = {'JOHN', 'TERROR', 'MARIA'}
+            expected = len(tokens & query_tokens) / len(tokens | query_tokens)
+            self.assertAlmostEqual(token_similarity, expected)
+    
+    def test_bulk_screening_matches_individual_screening(self):
+        """Teste de screening em lote equivalente ao screening individual"""
+        clean_customer = Customer.objects.create(
+            customer_type='INDIVIDUAL',
+            full_name='Carlos Oliveira',
+            document_number='98765432100',
+            email='carlos@example.com',
+            phone='+5511988888888',
+            address='Rua Teste, 456',
+            city='São Paulo',
+            state='SP',
+            postal_code='01234-567'
+        )
+        customers = [self.customer, clean_customer]
+        
+        sanctions_checks = self.service.bulk_screening(customers)
+        
+        self.assertEqual([check.customer for check in sanctions_checks], customers)
+        for customer, sanctions_check in zip(customers, sanctions_checks):
+            individual_check = self.service.screen_customer(customer)
+            self.assertEqual(sanctions_check.match_status, individual_check.match_status)
+            self.assertEqual(sanctions_check.total_matches, individual_check.total_matches)
+            self.assertEqual(sanctions_check.matches.count(), individual_check.total_matches)
+        
+        self.assertEqual(sanctions_checks[1].match_status, 'NO_MATCH')
+
+
+class SanctionsListManagementServiceTest(TestCase):
+    """Testes unitários para SanctionsListManagementService"""
+    
+    def setUp(self):
+        """Configuração inicial para os testes"""
+        self.service = SanctionsListManagementService()
+        self.entries_data = [
+            {
+                'primary_name': 'JOHN TERRORIST',
+                'aliases': ['JOHNNY TERROR', 'J. TERRORIST'],
+                'passport_number': 'AB123456',
+                'sanctions_reason': 'SDGT'
+            },
+            {'primary_name': 'MARIA DRUGDEALER'},
+        ]
+    
+    def test_update_sanctions_list_creates_entries(self):
+        """Teste de carga inicial de uma lista de sanções"""
+        sanctions_list = self.service.update_sanctions_list('OFAC SDN List', self.entries_data)
+        
+        entries = SanctionsEntry.objects.filter(sanctions_list=sanctions_list)
+        self.assertEqual(entries.count(), 2)
+        
+        entry = entries.get(primary_name='JOHN TERRORIST')
+        self.assertEqual(entry.alternative_names, 'JOHNNY TERROR\nJ. TERRORIST')
+        self.assertEqual(entry.normalized_alternative_names, ['JOHNNY TERROR', 'J TERRORIST'])
+        self.assertEqual(entry.sanctions_program, 'SDGT')
+        self.assertTrue(entry.is_active)
+    
+    def test_update_sanctions_list_updates_and_deactivates_entries(self):
+        """Teste de recarga atualizando e desativando entradas existentes"""
+        sanctions_list = self.service.update_sanctions_list('OFAC SDN List', self.entries_data)
+        original_entry = SanctionsEntry.objects.get(primary_name='JOHN TERRORIST')
+        
+        self.service.update_sanctions_list('OFAC SDN List', [
+            {'primary_name': 'JOHN TERRORIST', 'passport_number': 'CD987654'},
+        ])
+        
+        entries = SanctionsEntry.objects.filter(sanctions_list=sanctions_list)
+        self.assertEqual(entries.count(), 2)
+        
+        updated_entry = entries.get(primary_name='JOHN TERRORIST')
+        self.assertEqual(updated_entry.pk, original_entry.pk)
+        self.assertEqual(updated_entry.passport_number, 'CD987654')
+        self.assertTrue(updated_entry.is_active)
+        self.assertGreater(updated_entry.updated_at, original_entry.updated_at)
+        self.assertFalse(entries.get(primary_name='MARIA DRUGDEALER').is_active)
+    
+    def test_get_sanctions_statistics(self):
+        """Teste de estatísticas agregadas de listas, verificações e correspondências"""
+        self.service.update_sanctions_list('OFAC SDN List', self.entries_data)
+        customer = Customer.objects.create(
+            customer_type='INDIVIDUAL',
+            full_name='John Terrorist',
+            document_number='12345678901',
+            email='john@example.com',
+            phone='+5511999999999',
+            address='Rua Teste, 123',
+            city='São Paulo',
+            state='SP',
+            postal_code='01234-567'
+        )
+        sanctions_check = SanctionsScreeningService().screen_customer(customer)
+        sanctions_check.matches.update(review_status='CONFIRMED')
+        
+        with self.assertNumQueries(4):
+            statistics = self.service.get_sanctions_statistics()
+        
+        self.assertEqual(statistics['lists'], {'total_active_lists': 1, 'total_active_entries': 2})
+        self.assertEqual(statistics['screening'], {'total_checks': 1, 'recent_checks_30_days': 1})
+        self.assertEqual(statistics['matches'], {
+            'total_matches': sanctions_check.total_matches,
+            'confirmed_matches': sanctions_check.total_matches,
+            'false_positives': 0,
+            'pending_reviews': 0
+        })
+
+
+class NameSimilarityKernelTest(TestCase):
+    """Testes do kernel bit-paralelo usado sem rapidfuzz"""
+    
+    def test_bit_parallel_kernel_matches_default_scorer(self):
+        """Teste de equivalência entre o kernel bit-paralelo e o scorer padrão"""
+        queries = ['JOHN TERRORIST', 'MARIA SILVA', '']
+        choices = ['JOHN TERRORIST', 'JOHNNY TERROR', 'J TERRORIST', 'MARIA DRUGDEALER', '']
+        
+        expected = similarity.similarity_matrix(queries, choices)
+        with patch.object(similarity, 'process', None), patch.object(similarity, 'Indel', None):
+            fallback = similarity.similarity_matrix(queries, choices)
+            self.assertAlmostEqual(
+                similarity.normalized_similarity('JOHN TERRORIST', 'JOHNNY TERROR'),
+                float(expected[0, 1]),
+                places=5
+            )
+        
+        self.assertEqual(fallback.shape, (3, 5))
+        for query_index in range(len(queries)):
+            for choice_index in range(len(choices)):
+                self.assertAlmostEqual(
+                    float(fallback[query_index, choice_index]),
+                    float(expected[query_index, choice_index]),
+                    places=5
+                )
+    
+    def test_bit_parallel_kernel_applies_cutoff(self):
+        """Teste de descarte de pares abaixo do score_cutoff"""
+        with patch.object(similarity, 'process', None), patch.object(similarity, 'Indel', None):
+            scores = similarity.similarity_matrix(
+                ['JOHN TERRORIST'], ['JOHN TERRORIST', 'MARIA DRUGDEALER', 'JO'], score_cutoff=0.5
+            )
+        
+        self.assertEqual(scores[0, 0], 1.0)
+        self.assertEqual(scores[0, 1], 0.0)
+        self.assertEqual(scores[0, 2], 0.0)
+    
+    def test_bit_parallel_kernel_long_names(self):
+        """Teste de equivalência para nomes com mais de 64 caracteres"""
+        long_name = 'SOCIEDADE ANONIMA DE COMERCIO EXTERIOR E PARTICIPACOES INTERNACIONAIS DO ATLANTICO SUL LTDA'
+        choices = [
+            long_name,
+            long_name.replace('ATLANTICO SUL', 'PACIFICO NORTE'),
+            'SOCIEDADE ANONIMA DE COMERCIO EXTERIOR',
+        ]
+        self.assertGreater(len(long_name), 64)
+        
+        expected = similarity.similarity_matrix([long_name], choices)
+        with patch.object(similarity, 'process', None), patch.object(similarity, 'Indel', None):
+            fallback = similarity.similarity_matrix([long_name], choices)
+        
+        for choice_index in range(len(choices)):
+            self.assertAlmostEqual(
+                float(fallback[0, choice_index]),
+                float(expected[0, choice_index]),
+                places=5
+            )
@@ -4,6 +4,7 @@ Configuration for CERES Simplified system
 """
 
 import os
+import sys
 from pathlib import Path
 from decouple import config
 
@@ -27,9 +28,6 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     
-    # Third party apps
-    'debug_toolbar',
-    
     # Local apps
     'apps.core',
     'apps.customers',
@@ -50,8 +48,9 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
-# Add debug toolbar middleware in development
+# Add debug toolbar app and middleware in development only
 if DEBUG:
+    INSTALLED_APPS.insert(INSTALLED_APPS.index('apps.core'), 'debug_toolbar')
     MIDDLEWARE.insert(0, 'debug_toolbar.middleware.DebugToolbarMiddleware')
 
 ROOT_URLCONF = 'ceres.urls'
@@ -79,6 +78,11 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Banco de teste em memória; com --parallel cada worker recebe uma cópia.
+        # TEST_DB_NAME aponta para um arquivo que --keepdb reaproveita entre execuções
+        'TEST': {
+            'NAME': config('TEST_DB_NAME', default=':memory:'),
+        },
     }
 }
 
@@ -98,6 +102,13 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Execução da suíte de testes (python manage.py test)
+TESTING = len(sys.argv) > 1 and sys.argv[1] == 'test'
+
+if TESTING:
+    # Hash rápido nos testes: create_user deixa de pagar o PBKDF2 a cada usuário
+    PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
 # Internationalization
 LANGUAGE_CODE = 'pt-br'
 TIME_ZONE = 'America/Sao_Paulo'
@@ -192,3 +203,7 @@ CERES_SETTINGS = {
     }
 }
 
+# Segundos em que o resultado de um screening de sanções é reaproveitado
+# para os mesmos dados e listas inalteradas
+SANCTIONS_SCREENING_CACHE_TIMEOUT = config('SANCTIONS_SCREENING_CACHE_TIMEOUT', default=3600, cast=int)
+
@@ -9,6 +9,13 @@ from .settings import *
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = False
 
+# Ferramentas de desenvolvimento habilitadas pelo DEBUG das configurações base
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app != 'debug_toolbar']
+MIDDLEWARE = [
+    middleware for middleware in MIDDLEWARE
+    if middleware != 'debug_toolbar.middleware.DebugToolbarMiddleware'
+]
+
 # SECURITY WARNING: define the correct hosts in production
 ALLOWED_HOSTS = [
     'localhost',
@@ -31,15 +38,40 @@ DATABASES = {
         'OPTIONS': {
             'sslmode': 'require',
         },
+        # Conexões persistentes evitam handshake SSL e autenticação por requisição
+        'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 600)),
+        'CONN_HEALTH_CHECKS': True,
+        # Com --parallel os workers clonam o banco de teste via CREATE DATABASE ... TEMPLATE
+        'TEST': {
+            'NAME': os.environ.get('DB_TEST_NAME', 'ceres_test'),
+        },
     }
 }
 
+# Banco modelo opcional (com extensões já instaladas) para criar o banco de teste
+if os.environ.get('DB_TEST_TEMPLATE'):
+    DATABASES['default']['TEST']['TEMPLATE'] = os.environ['DB_TEST_TEMPLATE']
+
 # Fallback para SQLite se PostgreSQL não estiver disponível
 if not os.environ.get('DB_PASSWORD'):
     DATABASES = {
         'default': {
             'ENGINE': 'django.db.backends.sqlite3',
             'NAME': BASE_DIR / 'production.sqlite3',
+            'OPTIONS': {
+                # WAL permite leituras concorrentes com a escrita e, com
+                # synchronous=NORMAL, dispensa um fsync por commit
+                'init_command': (
+                    'PRAGMA journal_mode=WAL;'
+                    'PRAGMA synchronous=NORMAL;'
+                    'PRAGMA cache_size=-64000;'
+                    'PRAGMA temp_store=MEMORY;'
+                ),
+                'transaction_mode': 'IMMEDIATE',
+            },
+            'TEST': {
+                'NAME': ':memory:',
+            },
         }
     }
 
@@ -118,15 +150,30 @@ LOGGING = {
 }
 
 # Cache Configuration (Redis recomendado para produção)
+# Requer django-redis; com hiredis instalado o redis-py usa o parser em C
 CACHES = {
     'default': {
-        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'BACKEND': 'django_redis.cache.RedisCache',
         'LOCATION': os.environ.get('REDIS_URL', 'redis://127.0.0.1:6379/1'),
         'OPTIONS': {
             'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+            # Pool compartilhado por processo, sem novo handshake a cada acesso
+            'CONNECTION_POOL_CLASS': 'redis.BlockingConnectionPool',
+            'CONNECTION_POOL_KWARGS': {
+                'max_connections': int(os.environ.get('REDIS_MAX_CONNECTIONS', 50)),
+                'timeout': 5,
+                'socket_keepalive': True,
+            },
+            'SOCKET_CONNECT_TIMEOUT': 5,
+            'SOCKET_TIMEOUT': 5,
+            'COMPRESSOR': 'django_redis.compressors.zlib.ZlibCompressor',
+            # Falhas do Redis degradam para cache miss em vez de erro
+            'IGNORE_EXCEPTIONS': True,
         }
     }
 }
+DJANGO_REDIS_IGNORE_EXCEPTIONS = True
+DJANGO_REDIS_LOG_IGNORED_EXCEPTIONS = True
 
 # Fallback para cache local se Redis não estiver disponível
 if not os.environ.get('REDIS_URL'):
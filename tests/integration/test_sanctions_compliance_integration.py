@@ -4,508 +4,461 @@ Tests for integration between sanctions screening and compliance workflows
 """
 
 from decimal import Decimal
-from django.test import TestCase, TransactionTestCase
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Prefetch
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth.models import User
 from django.utils import timezone
-from datetime import date
+from types import MappingProxyType
 
 from apps.customers.models import Customer, BeneficialOwner
-from apps.sanctions.models import SanctionsList, SanctionsEntry, SanctionsScreening
-from apps.compliance.models import ComplianceRule, ComplianceCheck
-from apps.cases.models import Case
-from apps.risk.models import RiskAssessment
+from apps.sanctions.models import SanctionsList, SanctionsEntry, SanctionsCheck
+from apps.compliance.models import ComplianceRule, ComplianceCheck, ComplianceAlert
 
 from apps.sanctions.services import SanctionsScreeningService
 from apps.compliance.services import ComplianceWorkflowService
 from apps.core.services import AlertManagementService
 
 
-class SanctionsComplianceIntegrationTest(TransactionTestCase):
+class SanctionsComplianceIntegrationTest(TestCase):
     """Integration tests for sanctions screening and compliance workflows"""
     
-    def setUp(self):
-        """Set up test data"""
-        self.user = User.objects.create_user(
+    # Accepted outcomes shared by several assertions
+    SCREENING_STATUSES = frozenset({'NO_MATCH', 'POTENTIAL_MATCH', 'MATCH'})
+    
+    # Lists, entries (unless their index is already built) and checks; the
+    # bulk test customers match no entry, so no matches are inserted
+    BULK_SCREENING_QUERY_BUDGET = 3
+    
+    # Customer fields shared by most tests, overridden per test where relevant
+    _CUSTOMER_DEFAULTS = MappingProxyType({
+        'customer_type': 'INDIVIDUAL',
+        'country': 'US',
+        'phone': '+1234567890',
+        'city': 'New York',
+        'state': 'NY',
+        'postal_code': '10001',
+        'industry': 'TECHNOLOGY',
+    })
+    
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data once per class"""
+        # One clock reading shared by every fixture timestamp
+        cls.now = timezone.now()
+        cls.today = cls.now.date()
+        
+        cls.user = User.objects.create_user(
             username='compliance_officer',
             email='compliance@ceres.com',
             password='testpass123'
         )
         
         # Create sanctions list and entries
-        self.sanctions_list = SanctionsList.objects.create(
+        cls.sanctions_list = SanctionsList.objects.create(
             name='OFAC SDN List',
             description='OFAC Specially Designated Nationals List',
+            list_type='OFAC',
             source_url='https://www.treasury.gov/ofac/downloads/sdnlist.txt',
             is_active=True,
-            last_updated=timezone.now(),
-            total_entries=3
+            last_updated=cls.now
         )
         
         # Create various sanctions entries for testing
-        self.terrorist_entry = SanctionsEntry.objects.create(
-            sanctions_list=self.sanctions_list,
-            primary_name='JOHN TERRORIST',
-            nationality='XX',
-            address='Unknown Location',
-            listing_date=timezone.now().date(),
-            is_active=True
-        )
+        entries = [
+            SanctionsEntry(
+                sanctions_list=cls.sanctions_list,
+                primary_name='JOHN TERRORIST',
+                nationality='XX',
+                address='Unknown Location',
+                listing_date=cls.today,
+                is_active=True
+            ),
+            SanctionsEntry(
+                sanctions_list=cls.sanctions_list,
+                primary_name='MARIA DRUGDEALER',
+                nationality='CO',
+                address='Bogota, Colombia',
+                listing_date=cls.today,
+                is_active=True
+            ),
+            SanctionsEntry(
+                sanctions_list=cls.sanctions_list,
+                primary_name='ROBERT MONEYLAUNDERING',
+                nationality='RU',
+                address='Moscow, Russia',
+                listing_date=cls.today,
+                is_active=True
+            ),
+        ]
         
-        self.drug_dealer_entry = SanctionsEntry.objects.create(
-            sanctions_list=self.sanctions_list,
-            primary_name='MARIA DRUGDEALER',
-            nationality='CO',
-            address='Bogota, Colombia',
-            listing_date=timezone.now().date(),
-            is_active=True
-        )
-        
-        self.money_launderer_entry = SanctionsEntry.objects.create(
-            sanctions_list=self.sanctions_list,
-            primary_name='ROBERT MONEYLAUNDERING',
-            nationality='RU',
-            address='Moscow, Russia',
-            listing_date=timezone.now().date(),
-            is_active=True
-        )
+        # bulk_create() skips save(), so the normalized fields are filled here
+        for entry in entries:
+            entry.normalize_names()
+            entry.normalize_documents()
+        (
+            cls.terrorist_entry,
+            cls.drug_dealer_entry,
+            cls.money_launderer_entry,
+        ) = SanctionsEntry.objects.bulk_create(entries)
         
         # Create compliance rules
-        self.sanctions_rule = ComplianceRule.objects.create(
-            name='Sanctions Screening',
-            description='Screen customer against sanctions lists',
-            rule_type='SANCTIONS',
-            severity='CRITICAL',
-            auto_check=True,
-            is_active=True
-        )
-        
-        self.aml_rule = ComplianceRule.objects.create(
-            name='AML Risk Assessment',
-            description='Assess customer for AML risks',
-            rule_type='AML',
-            severity='HIGH',
-            auto_check=True,
-            is_active=True
-        )
-        
-        self.enhanced_dd_rule = ComplianceRule.objects.create(
-            name='Enhanced Due Diligence',
-            description='Enhanced due diligence for high-risk customers',
-            rule_type='EDD',
-            severity='HIGH',
-            auto_check=False,
-            is_active=True
-        )
-        
-        # Initialize services
+        (
+            cls.sanctions_rule,
+            cls.pep_rule,
+            cls.enhanced_dd_rule,
+        ) = ComplianceRule.objects.bulk_create([
+            ComplianceRule(
+                name='Sanctions Screening',
+                description='Screen customer against sanctions lists',
+                rule_type='SANCTIONS',
+                severity='CRITICAL',
+                auto_check=True,
+                is_active=True
+            ),
+            ComplianceRule(
+                name='PEP Screening',
+                description='Identify politically exposed persons',
+                rule_type='PEP',
+                severity='HIGH',
+                auto_check=True,
+                is_active=True
+            ),
+            ComplianceRule(
+                name='Enhanced Due Diligence',
+                description='Enhanced due diligence for high-risk customers',
+                rule_type='OTHER',
+                severity='HIGH',
+                auto_check=False,
+                is_active=True
+            ),
+        ])
+    
+    def setUp(self):
+        """Initialize services"""
+        # Screening results are cached by fingerprint and would leak between tests
+        cache.clear()
         self.sanctions_service = SanctionsScreeningService()
         self.compliance_service = ComplianceWorkflowService()
         self.alert_service = AlertManagementService()
     
+    def _build_customer(self, **fields):
+        """Unsaved customer with the shared defaults, e.g. for bulk_create"""
+        return Customer(**{**self._CUSTOMER_DEFAULTS, **fields})
+    
+    def _make_customer(self, **fields):
+        """Create a customer with the shared defaults"""
+        customer = self._build_customer(**fields)
+        customer.save()
+        return customer
+    
+    def _reload_with_alerts(self, pk, **alert_filters):
+        """Reload a customer with its (optionally filtered) alerts in one query per table"""
+        return Customer.objects.prefetch_related(
+            Prefetch(
+                'compliance_alerts',
+                queryset=ComplianceAlert.objects.filter(**alert_filters),
+                to_attr='loaded_alerts'
+            )
+        ).get(pk=pk)
+    
     def test_sanctions_hit_triggers_compliance_workflow(self):
         """Test that sanctions hit triggers appropriate compliance workflow"""
         # Create customer with name matching sanctions entry
-        customer = Customer.objects.create(
-            customer_type='INDIVIDUAL',
-            first_name='John',
-            last_name='Terrorist',
-            date_of_birth=date(1980, 1, 1),
-            nationality='XX',
+        customer = self._make_customer(
+            full_name='John Terrorist',
+            document_number='SANC-0001',
             country='XX',
             email='john.terrorist@example.com',
-            phone='+1234567890',
             address='123 Suspicious St',
             city='Unknown',
+            state='XX',
             postal_code='00000',
-            industry='OTHER',
-            expected_monthly_volume=Decimal('10000.00'),
-            source_of_funds='OTHER'
+            industry='OTHER'
         )
         
         # Perform sanctions screening
-        screening_result = self.sanctions_service.screen_customer(customer)
+        sanctions_check = self.sanctions_service.screen_customer(customer)
         
         # Verify sanctions hit detected
-        self.assertEqual(screening_result.screening_result, 'HIT')
-        self.assertGreater(screening_result.match_score, 80)
+        self.assertIsInstance(sanctions_check, SanctionsCheck)
+        self.assertEqual(sanctions_check.match_status, 'MATCH')
+        self.assertIn(
+            self.terrorist_entry.pk,
+            {match.sanctions_entry_id for match in sanctions_check.matches.all()}
+        )
         
         # Run compliance workflow
-        compliance_result = self.compliance_service.process_customer_compliance(
+        compliance_result = self.compliance_service.process_customer_onboarding(
             customer, self.user
         )
-        
-        # Verify compliance workflow was triggered
-        self.assertTrue(compliance_result['success'])
+        self.assertEqual(compliance_result['final_decision'], 'REJECTED')
         
         # Verify sanctions compliance check failed
-        sanctions_checks = ComplianceCheck.objects.filter(
+        compliance_check = ComplianceCheck.objects.filter(
             customer=customer,
-            compliance_rule=self.sanctions_rule
+            rule=self.sanctions_rule
+        ).first()
+        self.assertIsNotNone(compliance_check)
+        self.assertEqual(compliance_check.check_status, 'FAILED')
+        self.assertIn('matches sanctions list', compliance_check.result_details)
+        
+        # Verify an alert was raised for the failed check
+        alerts = self._reload_with_alerts(customer.pk).loaded_alerts
+        self.assertEqual(
+            [(alert.alert_type, alert.severity, alert.status) for alert in alerts],
+            [('RULE_VIOLATION', 'ERROR', 'OPEN')]
         )
-        self.assertGreater(sanctions_checks.count(), 0)
-        
-        sanctions_check = sanctions_checks.first()
-        self.assertEqual(sanctions_check.check_result, 'FAIL')
-        self.assertIn('sanctions hit', sanctions_check.check_details.lower())
-        
-        # Verify case was created for manual review
-        cases = Case.objects.filter(customer=customer)
-        self.assertGreater(cases.count(), 0)
-        
-        sanctions_case = cases.filter(case_type='SANCTIONS_REVIEW').first()
-        self.assertIsNotNone(sanctions_case)
-        self.assertEqual(sanctions_case.priority, 'HIGH')
-        self.assertEqual(sanctions_case.status, 'OPEN')
     
     def test_beneficial_owner_sanctions_hit_workflow(self):
         """Test sanctions hit on beneficial owner triggers compliance workflow"""
         # Create corporate customer
-        customer = Customer.objects.create(
-            customer_type='LEGAL_ENTITY',
-            company_name='Suspicious Corp',
-            nationality='US',
-            country='US',
+        customer = self._make_customer(
+            customer_type='CORPORATE',
+            full_name='Suspicious Corp',
+            legal_name='Suspicious Corp LLC',
+            document_number='SANC-0002',
             email='contact@suspicious.com',
-            phone='+1234567890',
-            address='456 Business Ave',
-            city='New York',
-            postal_code='10001',
-            industry='TECHNOLOGY',
-            expected_monthly_volume=Decimal('100000.00'),
-            source_of_funds='BUSINESS_REVENUE'
+            address='456 Business Ave'
         )
         
         # Create beneficial owner with sanctions hit
         beneficial_owner = BeneficialOwner.objects.create(
             customer=customer,
-            first_name='Maria',
-            last_name='Drugdealer',
-            date_of_birth=date(1975, 5, 10),
-            nationality='CO',
-            ownership_percentage=Decimal('51.00'),
-            is_control_person=True,
-            relationship_type='SHAREHOLDER'
+            full_name='Maria Drugdealer',
+            document_number='BO-0001',
+            country='CO',
+            ownership_percentage=Decimal('51.00')
         )
         
-        # Perform sanctions screening (should include beneficial owners)
-        screening_result = self.sanctions_service.screen_customer(customer)
+        # Screen the company and its beneficial owner
+        customer_check = self.sanctions_service.screen_customer(customer)
+        self.assertEqual(customer_check.match_status, 'NO_MATCH')
+        self.sanctions_service.screen_beneficial_owner(beneficial_owner)
         
         # Verify beneficial owner screening detected hit
-        bo_screenings = SanctionsScreening.objects.filter(
-            customer=customer,
-            screened_name__icontains='Maria'
-        )
-        self.assertGreater(bo_screenings.count(), 0)
+        # Single query, the assertions below read the fetched rows
+        bo_checks = list(SanctionsCheck.objects.filter(beneficial_owner=beneficial_owner))
+        self.assertEqual(len(bo_checks), 1)
         
-        bo_screening = bo_screenings.first()
-        self.assertEqual(bo_screening.screening_result, 'HIT')
+        bo_check = bo_checks[0]
+        self.assertEqual(bo_check.match_status, 'MATCH')
         
         # Run compliance workflow
-        compliance_result = self.compliance_service.process_customer_compliance(
-            customer, self.user
-        )
+        self.compliance_service.process_customer_onboarding(customer, self.user)
         
-        # Verify enhanced due diligence triggered
-        edd_checks = ComplianceCheck.objects.filter(
+        # Verify the owner's hit fails the sanctions check of the company
+        compliance_check = ComplianceCheck.objects.get(
             customer=customer,
-            compliance_rule=self.enhanced_dd_rule
+            rule=self.sanctions_rule
         )
-        self.assertGreater(edd_checks.count(), 0)
+        self.assertEqual(compliance_check.check_status, 'FAILED')
+        self.assertIn('Maria Drugdealer', compliance_check.result_details)
+        
+        # Rules without automatic checks are left for manual review
+        self.assertFalse(ComplianceCheck.objects.filter(
+            customer=customer,
+            rule=self.enhanced_dd_rule
+        ).exists())
         
         # Verify customer status updated
         customer.refresh_from_db()
-        self.assertEqual(customer.onboarding_status, 'REQUIRES_MANUAL_REVIEW')
+        self.assertEqual(customer.onboarding_status, 'REJECTED')
     
-    def test_multiple_sanctions_hits_escalation(self):
-        """Test escalation when multiple sanctions hits detected"""
-        # Create customer with multiple potential matches
-        customer = Customer.objects.create(
-            customer_type='INDIVIDUAL',
-            first_name='Robert',
-            last_name='Moneylaundering',
-            date_of_birth=date(1970, 12, 25),
-            nationality='RU',
+    def test_multiple_compliance_failures_escalation(self):
+        """Test escalation when a sanctions hit comes with other failed checks"""
+        # Create PEP customer matching a sanctions entry
+        customer = self._make_customer(
+            full_name='Robert Moneylaundering',
+            document_number='SANC-0003',
             country='RU',
             email='robert.ml@example.com',
             phone='+7234567890',
             address='123 Moscow St',
             city='Moscow',
+            state='MOW',
             postal_code='101000',
             industry='MONEY_SERVICES',
-            expected_monthly_volume=Decimal('1000000.00'),
-            source_of_funds='BUSINESS_REVENUE'
+            is_pep=True
         )
         
         # Perform sanctions screening
-        screening_result = self.sanctions_service.screen_customer(customer)
+        sanctions_check = self.sanctions_service.screen_customer(customer)
         
         # Verify high-confidence hit
-        self.assertEqual(screening_result.screening_result, 'HIT')
-        self.assertGreater(screening_result.match_score, 90)
+        self.assertEqual(sanctions_check.match_status, 'MATCH')
+        self.assertGreater(
+            max(match.match_score for match in sanctions_check.matches.all()),
+            90
+        )
         
         # Run compliance workflow
-        compliance_result = self.compliance_service.process_customer_compliance(
+        compliance_result = self.compliance_service.process_customer_onboarding(
             customer, self.user
         )
         
-        # Verify multiple compliance checks failed
+        # Verify both automatic checks failed
         failed_checks = ComplianceCheck.objects.filter(
             customer=customer,
-            check_result='FAIL'
+            check_status='FAILED'
         )
-        self.assertGreater(failed_checks.count(), 1)
-        
-        # Verify high-priority case created
-        cases = Case.objects.filter(customer=customer)
-        high_priority_cases = cases.filter(priority='CRITICAL')
-        self.assertGreater(high_priority_cases.count(), 0)
+        self.assertEqual(
+            set(failed_checks.values_list('rule_id', flat=True)),
+            {self.sanctions_rule.pk, self.pep_rule.pk}
+        )
+        self.assertEqual(len(compliance_result['checks_failed']), 2)
         
-        # Verify customer immediately suspended
-        customer.refresh_from_db()
+        # Verify customer rejected, with a single alert for the failures
+        customer = self._reload_with_alerts(customer.pk, alert_type='RULE_VIOLATION')
+        self.assertEqual(len(customer.loaded_alerts), 1)
         self.assertEqual(customer.onboarding_status, 'REJECTED')
     
     def test_false_positive_sanctions_handling(self):
         """Test handling of false positive sanctions matches"""
         # Create customer with similar but not exact match
-        customer = Customer.objects.create(
-            customer_type='INDIVIDUAL',
-            first_name='John',
-            last_name='Terror',  # Similar but not exact match
-            date_of_birth=date(1990, 6, 15),  # Different age
-            nationality='US',  # Different nationality
-            country='US',
+        customer = self._make_customer(
+            full_name='John Terror',  # Similar but not exact match
+            document_number='SANC-0004',
             email='john.terror@example.com',
-            phone='+1234567890',
-            address='123 Normal St',
-            city='New York',
-            postal_code='10001',
-            industry='TECHNOLOGY',
-            expected_monthly_volume=Decimal('50000.00'),
-            source_of_funds='SALARY'
+            address='123 Normal St'
         )
         
         # Perform sanctions screening
-        screening_result = self.sanctions_service.screen_customer(customer)
+        sanctions_check = self.sanctions_service.screen_customer(customer)
         
-        # Should detect potential match but with lower confidence
-        if screening_result.screening_result == 'HIT':
-            self.assertLess(screening_result.match_score, 80)
-        else:
-            self.assertEqual(screening_result.screening_result, 'CLEAR')
+        # Should detect a potential match only
+        self.assertEqual(sanctions_check.match_status, 'POTENTIAL_MATCH')
         
         # Run compliance workflow
-        compliance_result = self.compliance_service.process_customer_compliance(
+        compliance_result = self.compliance_service.process_customer_onboarding(
             customer, self.user
         )
         
-        # Should pass or require manual review, not automatic rejection
-        customer.refresh_from_db()
-        self.assertIn(customer.onboarding_status, [
-            'APPROVED', 'PENDING_REVIEW', 'REQUIRES_MANUAL_REVIEW'
-        ])
-        self.assertNotEqual(customer.onboarding_status, 'REJECTED')
-    
-    def test_sanctions_screening_with_risk_assessment_integration(self):
-        """Test integration between sanctions screening and risk assessment"""
-        # Create medium-risk customer
-        customer = Customer.objects.create(
-            customer_type='INDIVIDUAL',
-            first_name='Medium',
-            last_name='Risk',
-            date_of_birth=date(1985, 3, 15),
-            nationality='US',
-            country='US',
-            email='medium.risk@example.com',
-            phone='+1234567890',
-            address='123 Medium St',
-            city='New York',
-            postal_code='10001',
-            industry='TECHNOLOGY',
-            expected_monthly_volume=Decimal('75000.00'),
-            source_of_funds='SALARY'
-        )
-        
-        # Create risk assessment
-        risk_assessment = RiskAssessment.objects.create(
-            customer=customer,
-            assessment_type='INITIAL',
-            base_score=50,
-            final_score=65,
-            risk_level='MEDIUM',
-            methodology='CERES Simplified',
-            justification='Medium risk customer',
-            assessed_by=self.user,
-            is_current=True
-        )
-        
-        # Perform sanctions screening
-        screening_result = self.sanctions_service.screen_customer(customer)
-        
-        # Should be clear
-        self.assertEqual(screening_result.screening_result, 'CLEAR')
-        
-        # Run compliance workflow
-        compliance_result = self.compliance_service.process_customer_compliance(
-            customer, self.user
+        # Should require manual review, not automatic rejection
+        self.assertTrue(compliance_result['requires_manual_review'])
+        customer = self._reload_with_alerts(customer.pk)
+        self.assertEqual(customer.onboarding_status, 'REQUIRES_MANUAL_REVIEW')
+        self.assertEqual(
+            [alert.alert_type for alert in customer.loaded_alerts],
+            ['REVIEW_DUE']
         )
-        
-        # Verify compliance considers risk level
-        compliance_checks = compliance_result['checks']
-        
-        # Medium risk should trigger standard checks
-        sanctions_checks = [c for c in compliance_checks if c.compliance_rule == self.sanctions_rule]
-        self.assertGreater(len(sanctions_checks), 0)
-        
-        sanctions_check = sanctions_checks[0]
-        self.assertEqual(sanctions_check.check_result, 'PASS')
     
     def test_ongoing_sanctions_monitoring(self):
         """Test ongoing sanctions monitoring for existing customers"""
         # Create approved customer
-        customer = Customer.objects.create(
-            customer_type='INDIVIDUAL',
-            first_name='Approved',
-            last_name='Customer',
-            date_of_birth=date(1985, 1, 1),
-            nationality='US',
-            country='US',
+        customer = self._make_customer(
+            full_name='Approved Customer',
+            document_number='SANC-0005',
             email='approved@example.com',
-            phone='+1234567890',
             address='123 Approved St',
-            city='New York',
-            postal_code='10001',
-            industry='TECHNOLOGY',
-            expected_monthly_volume=Decimal('50000.00'),
-            source_of_funds='SALARY',
             onboarding_status='APPROVED'
         )
         
         # Initial screening (should be clear)
-        initial_screening = self.sanctions_service.screen_customer(customer)
-        self.assertEqual(initial_screening.screening_result, 'CLEAR')
-        
-        # Simulate new sanctions entry added that matches customer
-        new_sanctions_entry = SanctionsEntry.objects.create(
-            sanctions_list=self.sanctions_list,
-            primary_name='APPROVED CUSTOMER',
-            nationality='US',
-            address='123 Approved St, New York',
-            listing_date=timezone.now().date(),
-            is_active=True
-        )
-        
-        # Update sanctions list count
-        self.sanctions_list.total_entries += 1
-        self.sanctions_list.save()
+        initial_check = self.sanctions_service.screen_customer(customer)
+        self.assertEqual(initial_check.match_status, 'NO_MATCH')
+        
+        # Simulate new sanctions entry added that matches customer, committed
+        # once as a list import would be
+        with transaction.atomic():
+            SanctionsEntry.objects.create(
+                sanctions_list=self.sanctions_list,
+                primary_name='APPROVED CUSTOMER',
+                nationality='US',
+                address='123 Approved St, New York',
+                listing_date=self.today,
+                is_active=True
+            )
         
-        # Perform re-screening
-        rescreening_result = self.sanctions_service.screen_customer(customer)
+        # Perform re-screening; the new entry changes the screening
+        # fingerprint, so the earlier result is not reused
+        rescreening_check = self.sanctions_service.screen_customer(customer)
+        self.assertNotEqual(rescreening_check.screening_fingerprint, initial_check.screening_fingerprint)
         
         # Should now detect hit
-        self.assertEqual(rescreening_result.screening_result, 'HIT')
+        self.assertEqual(rescreening_check.match_status, 'MATCH')
         
         # Run compliance workflow for existing customer
-        compliance_result = self.compliance_service.process_customer_compliance(
-            customer, self.user
-        )
+        self.compliance_service.process_customer_onboarding(customer, self.user)
         
         # Verify customer status updated
-        customer.refresh_from_db()
-        self.assertEqual(customer.onboarding_status, 'SUSPENDED')
+        customer = self._reload_with_alerts(customer.pk, alert_type='RULE_VIOLATION')
+        self.assertEqual(customer.onboarding_status, 'REJECTED')
         
-        # Verify case created for investigation
-        investigation_cases = Case.objects.filter(
-            customer=customer,
-            case_type='SANCTIONS_REVIEW'
-        )
-        self.assertGreater(investigation_cases.count(), 0)
+        # Verify alert raised for investigation
+        self.assertEqual(len(customer.loaded_alerts), 1)
     
     def test_compliance_workflow_with_alert_management(self):
         """Test integration between compliance workflow and alert management"""
-        # Create high-risk customer with sanctions concerns
-        customer = Customer.objects.create(
-            customer_type='INDIVIDUAL',
-            first_name='Alert',
-            last_name='Test',
-            date_of_birth=date(1980, 1, 1),
-            nationality='AF',  # High-risk country
-            country='AF',
+        # Create PEP customer without enhanced due diligence documentation
+        customer = self._make_customer(
+            full_name='Alert Test',
+            document_number='SANC-0006',
+            country='AF',  # High-risk country
             email='alert.test@example.com',
             phone='+93234567890',
             address='123 Alert St',
             city='Kabul',
+            state='KB',
             postal_code='1001',
             industry='MONEY_SERVICES',
-            expected_monthly_volume=Decimal('500000.00'),
-            source_of_funds='BUSINESS_REVENUE',
             is_pep=True
         )
         
         # Perform sanctions screening
-        screening_result = self.sanctions_service.screen_customer(customer)
+        sanctions_check = self.sanctions_service.screen_customer(customer)
+        self.assertEqual(sanctions_check.match_status, 'NO_MATCH')
         
         # Run compliance workflow
-        compliance_result = self.compliance_service.process_customer_compliance(
+        compliance_result = self.compliance_service.process_customer_onboarding(
             customer, self.user
         )
+        self.assertEqual(compliance_result['final_decision'], 'REJECTED')
         
         # Process alerts
-        alert_result = self.alert_service.process_customer_alerts(customer)
+        alert_result = self.alert_service.process_high_priority_alerts()
         
-        # Verify alerts were generated
-        self.assertTrue(alert_result['alerts_processed'])
-        self.assertGreater(alert_result['total_alerts'], 0)
+        # Verify the failed PEP check raised a high-priority alert
+        self.assertEqual(alert_result['total_processed'], 1)
+        self.assertEqual(alert_result['errors'], 0)
         
-        # Verify high-priority alerts for compliance issues
-        high_priority_alerts = [
-            alert for alert in alert_result['alerts'] 
-            if alert.get('priority') == 'HIGH'
-        ]
-        self.assertGreater(len(high_priority_alerts), 0)
+        # Nothing resolved the failure, so the alert stays open
+        alert = ComplianceAlert.objects.get(customer=customer)
+        self.assertEqual((alert.alert_type, alert.severity), ('RULE_VIOLATION', 'ERROR'))
+        self.assertEqual(alert.status, 'OPEN')
     
     def test_bulk_sanctions_screening_performance(self):
         """Test performance of bulk sanctions screening"""
-        # Create multiple customers for bulk screening
-        customers = []
-        for i in range(10):
-            customer = Customer.objects.create(
-                customer_type='INDIVIDUAL',
-                first_name=f'Bulk{i}',
-                last_name='Test',
-                date_of_birth=date(1980 + i, 1, 1),
-                nationality='US',
-                country='US',
+        # Create multiple customers for bulk screening in one INSERT
+        customers = Customer.objects.bulk_create([
+            self._build_customer(
+                full_name=f'Bulk{i} Test',
+                document_number=f'BULK-{i:04d}',
                 email=f'bulk{i}@example.com',
                 phone=f'+123456789{i}',
-                address=f'123 Bulk{i} St',
-                city='New York',
-                postal_code='10001',
-                industry='TECHNOLOGY',
-                expected_monthly_volume=Decimal('50000.00'),
-                source_of_funds='SALARY'
+                address=f'123 Bulk{i} St'
             )
-            customers.append(customer)
-        
-        # Perform bulk screening
-        import time
-        start_time = time.time()
-        
-        screening_results = []
-        for customer in customers:
-            result = self.sanctions_service.screen_customer(customer)
-            screening_results.append(result)
+            for i in range(10)
+        ])
         
-        end_time = time.time()
-        processing_time = end_time - start_time
+        # Perform bulk screening; one batched screening scores every customer
+        # against each list at once
+        with CaptureQueriesContext(connection) as queries:
+            screening_results = self.sanctions_service.bulk_screening(customers)
         
         # Verify all screenings completed
         self.assertEqual(len(screening_results), 10)
         
-        # Verify reasonable performance (should complete in under 10 seconds)
-        self.assertLess(processing_time, 10.0)
+        # Verify the query count does not grow with the number of customers
+        screening_queries = [
+            query['sql'] for query in queries.captured_queries
+            if not query['sql'].startswith(('SAVEPOINT', 'RELEASE SAVEPOINT'))
+        ]
+        self.assertLessEqual(len(screening_queries), self.BULK_SCREENING_QUERY_BUDGET)
         
         # Verify all results are valid
         for result in screening_results:
-            self.assertIsInstance(result, SanctionsScreening)
-            self.assertIn(result.screening_result, ['CLEAR', 'HIT', 'POTENTIAL_MATCH'])
-
+            self.assertIsInstance(result, SanctionsCheck)
+            self.assertIn(result.match_status, self.SCREENING_STATUSES)